@@ -0,0 +1,81 @@
+"""Approximate counts of a stream of ints in fixed memory.
+
+A Count-Min sketch keeps depth rows of width counters. Adding a value bumps
+one counter in every row, picked by that row's multiply-shift hash, and the
+estimate for a value is the smallest of its counters. Estimates never
+undercount; with n values added they overcount by more than e * n / width
+with probability at most about e ** -depth. Hashes work on the values mod
+2**64, so NumPy and the pure-Python fallback give identical sketches.
+"""
+
+import random
+from array import array
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MASK = (1 << 64) - 1
+
+
+class CountMinSketch:
+    def __init__(self, width: int = 1 << 18, depth: int = 4, seed: int = 0) -> None:
+        if width < 2 or width & (width - 1) or depth < 1:
+            raise ValueError("width must be a power of two >= 2, depth >= 1")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._shift = 64 - (width.bit_length() - 1)
+        rng = random.Random(seed)
+        # an odd multiplier and an offset per row
+        self._hashes = [
+            (rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(depth)
+        ]
+        if np is not None:
+            self._counts = np.zeros((depth, width), dtype=np.int64)
+        else:
+            self._rows: List[array] = [
+                array("q", bytes(8 * width)) for _ in range(depth)
+            ]
+
+    def _slots(self, values: "np.ndarray", row: int) -> "np.ndarray":
+        a, b = self._hashes[row]
+        return (values * np.uint64(a) + np.uint64(b)) >> np.uint64(self._shift)
+
+    def update(self, values: Iterable[int]) -> None:
+        """Add every value once; arrays of int64 are hashed in bulk."""
+        values = array("q", values)
+        self.total += len(values)
+        if np is not None:
+            keys = np.frombuffer(values, dtype=np.uint64)
+            for row in range(self.depth):
+                self._counts[row] += np.bincount(
+                    self._slots(keys, row), minlength=self.width
+                )
+            return
+        for (a, b), counts in zip(self._hashes, self._rows):
+            for value in values:
+                counts[((a * (value & _MASK) + b) & _MASK) >> self._shift] += 1
+
+    def estimates(self, values: Iterable[int]) -> array:
+        """The estimated count of each of values, in order."""
+        values = array("q", values)
+        if np is not None:
+            keys = np.frombuffer(values, dtype=np.uint64)
+            found = self._counts[0, self._slots(keys, 0)]
+            for row in range(1, self.depth):
+                found = np.minimum(found, self._counts[row, self._slots(keys, row)])
+            return array("q", found.tobytes())
+        return array("q", map(self.estimate, values))
+
+    def estimate(self, value: int) -> int:
+        key = value & _MASK
+        rows = self._counts if np is not None else self._rows
+        return int(
+            min(
+                counts[((a * key + b) & _MASK) >> self._shift]
+                for (a, b), counts in zip(self._hashes, rows)
+            )
+        )
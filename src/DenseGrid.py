@@ -0,0 +1,191 @@
+"""Dense rectangular views of grids and whole-grid neighbourhood operations.
+
+With NumPy installed a DenseGrid holds an int64 array and every operation is
+a handful of array expressions; without it the same methods run as loops
+over lists of rows, so callers never need to know which one they got.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from SparseGrid import SparseGrid
+from TiledGrid import TiledGrid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# an int64 array with NumPy, otherwise a list of equal-length rows
+Cells = Any
+# (dy, dx) -> weight
+Kernel = Dict[Tuple[int, int], int]
+
+CROSS: Kernel = {(-1, 0): 1, (1, 0): 1, (0, -1): 1, (0, 1): 1}
+RING: Kernel = {
+    (dy, dx): 1 for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx
+}
+
+
+class DenseGrid:
+    """A block of a grid: cells[r][c] is grid cell (origin_y + r, origin_x + c).
+
+    Masks, counts and labels returned by the methods have the same shape and
+    type as cells; positions they report are grid coordinates.
+    """
+
+    def __init__(self, cells: Cells, origin: Tuple[int, int] = (0, 0)) -> None:
+        self.cells = cells
+        self.origin = origin
+        self.height = len(cells)
+        self.width = len(cells[0]) if self.height else 0
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Sequence[int]], origin: Tuple[int, int] = (0, 0)
+    ) -> "DenseGrid":
+        """Rows of unequal length are padded with 0 on the right."""
+        width = max(map(len, rows), default=0)
+        if any(len(row) != width for row in rows):
+            rows = [list(row) + [0] * (width - len(row)) for row in rows]
+        if np is not None:
+            cells = np.array(rows, dtype=np.int64).reshape(len(rows), width)
+            return cls(cells, origin)
+        return cls([list(row) for row in rows], origin)
+
+    @classmethod
+    def from_grid(cls, grid: Union[SparseGrid, TiledGrid]) -> "DenseGrid":
+        """The smallest block holding every non-zero cell of grid."""
+        bounds = grid.bounds()
+        if bounds is None:
+            return cls.from_rows([])
+        min_y, max_y, min_x, max_x = bounds
+        rows = [grid.row(y, min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+        return cls.from_rows(rows, (min_y, min_x))
+
+    def mask(self, predicate: Callable[..., Any], *layers: Cells) -> Cells:
+        """predicate(value, *layer values) for every cell.
+
+        With NumPy the predicate is called once with whole arrays, so it
+        should stick to operators that work on both (==, <, &, |, ~, +).
+        """
+        if np is not None:
+            result = predicate(self.cells, *map(np.asarray, layers))
+            return np.asarray(result, dtype=bool)
+        return [
+            [bool(predicate(*values)) for values in zip(*rows)]
+            for rows in zip(self.cells, *layers)
+        ]
+
+    def where(self, mask: Cells) -> List[Tuple[int, int]]:
+        """Grid positions (y, x) of the true cells of mask, row by row."""
+        oy, ox = self.origin
+        if np is not None:
+            ys, xs = np.nonzero(mask)
+            return list(zip((ys + oy).tolist(), (xs + ox).tolist()))
+        return [
+            (oy + r, ox + c)
+            for r, row in enumerate(mask)
+            for c, flag in enumerate(row)
+            if flag
+        ]
+
+    def convolve(self, values: Cells, kernel: Kernel) -> Cells:
+        """out[r][c] = sum of weight * values[r + dy][c + dx] over the kernel;
+        cells outside the block count as 0."""
+        h, w = self.height, self.width
+        if np is not None:
+            values = np.asarray(values, dtype=np.int64)
+            out = np.zeros((h, w), dtype=np.int64)
+            for (dy, dx), weight in kernel.items():
+                if abs(dy) >= h or abs(dx) >= w:
+                    continue
+                dst, src = _shifted(dy, dx, h, w)
+                out[dst] += weight * values[src]
+            return out
+        out = [[0] * w for _ in range(h)]
+        for r in range(h):
+            for c in range(w):
+                total = 0
+                for (dy, dx), weight in kernel.items():
+                    nr, nc = r + dy, c + dx
+                    if 0 <= nr < h and 0 <= nc < w:
+                        total += weight * values[nr][nc]
+                out[r][c] = total
+        return out
+
+    def neighbour_counts(self, mask: Cells, kernel: Kernel = CROSS) -> Cells:
+        """Number of kernel neighbours of each cell that are set in mask."""
+        return self.convolve(mask, kernel)
+
+    def label(self, mask: Cells, kernel: Kernel = CROSS) -> Tuple[Cells, int]:
+        """Connected regions of mask, joined through the kernel's offsets.
+
+        Returns (labels, count): labels are 1..count, numbered in the order
+        their first cell appears row by row, and 0 outside the mask.
+        """
+        h, w = self.height, self.width
+        if np is not None:
+            return _label_array(np.asarray(mask, dtype=bool), kernel)
+        labels = [[0] * w for _ in range(h)]
+        count = 0
+        for r in range(h):
+            for c in range(w):
+                if not mask[r][c] or labels[r][c]:
+                    continue
+                count += 1
+                labels[r][c] = count
+                todo = deque([(r, c)])
+                while todo:
+                    y, x = todo.popleft()
+                    for dy, dx in kernel:
+                        ny, nx = y + dy, x + dx
+                        if (
+                            0 <= ny < h
+                            and 0 <= nx < w
+                            and mask[ny][nx]
+                            and not labels[ny][nx]
+                        ):
+                            labels[ny][nx] = count
+                            todo.append((ny, nx))
+        return labels, count
+
+
+def _shifted(dy: int, dx: int, h: int, w: int) -> Tuple[Any, Any]:
+    # index pairs such that out[dst] lines up with values[src] moved by
+    # (-dy, -dx): out[r, c] pairs with values[r + dy, c + dx]
+    rows = slice(max(0, -dy), h - max(0, dy)), slice(max(0, dy), h - max(0, -dy))
+    cols = slice(max(0, -dx), w - max(0, dx)), slice(max(0, dx), w - max(0, -dx))
+    return (rows[0], cols[0]), (rows[1], cols[1])
+
+
+def _label_array(mask: Any, kernel: Kernel) -> Tuple[Any, int]:
+    # union-find over the flat indices: every round hooks the root of each
+    # edge's larger end under the root of its smaller end, then compresses
+    # all paths, so the smallest index of each region ends up as its root
+    h, w = mask.shape
+    index = np.arange(h * w, dtype=np.int64).reshape(h, w)
+    # the two ends of every edge between masked cells
+    u = np.zeros(0, dtype=np.int64)
+    v = np.zeros(0, dtype=np.int64)
+    for dy, dx in kernel:
+        if abs(dy) < h and abs(dx) < w:
+            dst, src = _shifted(dy, dx, h, w)
+            both = mask[dst] & mask[src]
+            u = np.concatenate((u, index[dst][both]))
+            v = np.concatenate((v, index[src][both]))
+    parent = index.ravel().copy()
+    while True:
+        pu, pv = parent[u], parent[v]
+        if np.array_equal(pu, pv):
+            break
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    roots, inverse = np.unique(parent.reshape(h, w)[mask], return_inverse=True)
+    labels = np.zeros((h, w), dtype=np.int64)
+    labels[mask] = inverse + 1
+    return labels, len(roots)
@@ -0,0 +1,117 @@
+"""Shortest distances from a fixed source over a map that is still changing.
+
+The field only knows the cells it has been told are open; everything else
+is treated as blocked. Opening a cell relaxes distances outwards from it
+and only touches the cells that actually get closer. Closing a cell (a
+wall where an open cell used to be) first finds, level by level, the cells
+that have no shortest route left that avoids it, then rebuilds just those
+from their unaffected neighbours. Queries are dictionary lookups, so the
+distance to a target can be asked after every step of an exploration.
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from Pathfinding import STEPS, Pos
+
+
+class DistanceField:
+    def __init__(self, source: Pos) -> None:
+        self.source = source
+        self.open_cells: Set[Pos] = set()
+        # steps from source for every open cell connected to it
+        self.dist: Dict[Pos, int] = {}
+        self.open(source)
+
+    def _neighbours(self, pos: Pos) -> List[Pos]:
+        a, b = pos
+        cells = self.open_cells
+        return [nxt for da, db in STEPS if (nxt := (a + da, b + db)) in cells]
+
+    def open(self, pos: Pos) -> None:
+        """Mark pos as open and lower the distances that it shortens."""
+        if pos in self.open_cells:
+            return
+        self.open_cells.add(pos)
+        dist = self.dist
+        if pos == self.source:
+            dist[pos] = 0
+        else:
+            known = [dist[n] for n in self._neighbours(pos) if n in dist]
+            if not known:
+                return
+            dist[pos] = min(known) + 1
+        todo = deque([pos])
+        while todo:
+            cur = todo.popleft()
+            d = dist[cur] + 1
+            for nxt in self._neighbours(cur):
+                if dist.get(nxt, d + 1) > d:
+                    dist[nxt] = d
+                    todo.append(nxt)
+
+    def close(self, pos: Pos) -> None:
+        """Mark pos as blocked and raise the distances that went through it."""
+        if pos not in self.open_cells:
+            return
+        self.open_cells.discard(pos)
+        dist = self.dist
+        if pos not in dist:
+            return
+        if pos == self.source:
+            dist.clear()
+            return
+        del dist[pos]
+
+        # cells lose their distance when none of their neighbours one step
+        # closer keeps it; by level, so every cell's supports are settled
+        affected: Set[Pos] = set()
+        heap = [(dist[n], n) for n in self._neighbours(pos) if n in dist]
+        heapq.heapify(heap)
+        while heap:
+            d, cur = heapq.heappop(heap)
+            if cur in affected or cur == self.source:
+                continue
+            nearer = self._neighbours(cur)
+            if any(dist.get(n) == d - 1 and n not in affected for n in nearer):
+                continue
+            affected.add(cur)
+            for n in nearer:
+                if dist.get(n) == d + 1:
+                    heapq.heappush(heap, (d + 1, n))
+
+        # give the affected cells new distances through what is left
+        for cur in affected:
+            del dist[cur]
+        heap = []
+        for cur in affected:
+            known = [dist[n] for n in self._neighbours(cur) if n in dist]
+            if known:
+                heap.append((min(known) + 1, cur))
+        heapq.heapify(heap)
+        while heap:
+            d, cur = heapq.heappop(heap)
+            if dist.get(cur, d + 1) <= d:
+                continue
+            dist[cur] = d
+            for n in self._neighbours(cur):
+                if n in affected and dist.get(n, d + 2) > d + 1:
+                    heapq.heappush(heap, (d + 1, n))
+
+    def distance(self, pos: Pos) -> Optional[int]:
+        """Steps from source to pos over open cells, None if unreachable."""
+        return self.dist.get(pos)
+
+    def path(self, pos: Pos) -> List[Pos]:
+        """A shortest path from source to pos, both included; [] if none."""
+        dist = self.dist
+        if pos not in dist:
+            return []
+        path = [pos]
+        while pos != self.source:
+            d = dist[pos]
+            pos = next(n for n in self._neighbours(pos) if dist.get(n) == d - 1)
+            path.append(pos)
+        path.reverse()
+        return path
@@ -0,0 +1,131 @@
+"""Sorting streams of ints that do not fit in memory.
+
+An ExternalSorter collects values into runs of run_size, sorts every full
+run in memory and spills it to a temp file as packed int64s. Iterating it
+merges the runs with heapq.merge, reading each one a block at a time. With
+more than fan_in runs the merge first combines them fan_in at a time into
+longer runs on disk, so the number of runs read at once stays bounded too.
+Peak memory is about run_size + fan_in * block values, however many values
+go in. Values must fit in 64 bits; extend() raises OverflowError otherwise.
+"""
+
+import heapq
+import itertools
+import os
+import tempfile
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (offset in the spill file, number of values) of a sorted run
+Run = Tuple[int, int]
+
+
+def _sort(values: array) -> array:
+    if np is not None:
+        return array("q", np.sort(np.frombuffer(values, dtype=np.int64)).tobytes())
+    return array("q", sorted(values))
+
+
+def _read_run(f: BinaryIO, run: Run, block: int) -> Iterator[int]:
+    # runs share one file, so seek before every block
+    pos, count = run
+    while count:
+        f.seek(pos)
+        values = array("q")
+        values.fromfile(f, min(count, block))
+        pos = f.tell()
+        count -= len(values)
+        yield from values
+
+
+class ExternalSorter:
+    def __init__(
+        self,
+        run_size: int = 1_000_000,
+        fan_in: int = 64,
+        block: int = 1 << 14,
+        dir: Optional[str | os.PathLike] = None,
+    ) -> None:
+        if run_size < 1 or fan_in < 2 or block < 1:
+            raise ValueError("need run_size >= 1, fan_in >= 2 and block >= 1")
+        self.run_size = run_size
+        self.fan_in = fan_in
+        self.block = block
+        self.dir = dir
+        self.count = 0
+        self._buffer = array("q")
+        self._file: Optional[BinaryIO] = None
+        self._runs: List[Run] = []
+
+    def extend(self, values: Iterable[int]) -> None:
+        it = iter(values)
+        buffer = self._buffer
+        while True:
+            room = self.run_size - len(buffer)
+            piece = array("q", itertools.islice(it, room))
+            buffer.extend(piece)
+            self.count += len(piece)
+            if len(buffer) == self.run_size:
+                self._spill()
+                buffer = self._buffer
+            if len(piece) < room:
+                return
+
+    def _spill(self) -> None:
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.dir)
+        f = self._file
+        f.seek(0, os.SEEK_END)
+        self._runs.append((f.tell(), len(self._buffer)))
+        _sort(self._buffer).tofile(f)
+        self._buffer = array("q")
+
+    def _merge_pass(self) -> None:
+        # combine groups of fan_in runs into one run each, in a new file
+        old, f = self._file, tempfile.TemporaryFile(dir=self.dir)
+        runs: List[Run] = []
+        for i in range(0, len(self._runs), self.fan_in):
+            group = self._runs[i : i + self.fan_in]
+            runs.append((f.tell(), sum(count for _, count in group)))
+            merged = heapq.merge(*(_read_run(old, run, self.block) for run in group))
+            while chunk := array("q", itertools.islice(merged, self.block)):
+                chunk.tofile(f)
+        old.close()
+        self._file, self._runs = f, runs
+
+    def __iter__(self) -> Iterator[int]:
+        """The values added so far, in ascending order."""
+        if not self._runs:
+            return iter(_sort(self._buffer))
+        if self._buffer:
+            self._spill()
+        while len(self._runs) > self.fan_in:
+            self._merge_pass()
+        f, block = self._file, self.block
+        return heapq.merge(*(_read_run(f, run, block) for run in self._runs))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._runs = []
+        self._buffer = array("q")
+        self.count = 0
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def external_sorted(values: Iterable[int], run_size: int = 1_000_000) -> Iterator[int]:
+    """values in ascending order, sorted with a temporary ExternalSorter."""
+    with ExternalSorter(run_size) as sorter:
+        sorter.extend(values)
+        yield from sorter
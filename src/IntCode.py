@@ -1,5 +1,22 @@
+from collections import deque
 from enum import Enum
-from typing import Callable, List, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from IntCodeNative import NativeImage
 
 
 class OP(Enum):
@@ -20,7 +37,10 @@ class OP(Enum):
 
     @classmethod
     def from_code(cls, code):
-        return next((op for op in cls if op.code == code), OP.HALT)
+        return _OPS_BY_CODE.get(code, OP.HALT)
+
+
+_OPS_BY_CODE: Dict[int, OP] = {op.code: op for op in OP}
 
 
 def _parse_op(op: int) -> Tuple[OP, List[int]]:
@@ -34,92 +54,797 @@ def _parse_op(op: int) -> Tuple[OP, List[int]]:
     return (OP.from_code(code), modes)
 
 
+# instruction word -> (op, modes). Keyed by the word rather than the address, so
+# self-modifying code simply decodes its new word and nothing needs invalidating.
+_DECODE_CACHE: Dict[int, Tuple[OP, Tuple[int, int, int]]] = {}
+
+
+def _decode(word: int) -> Tuple[OP, Tuple[int, int, int]]:
+    try:
+        return _DECODE_CACHE[word]
+    except KeyError:
+        op, modes = _parse_op(word)
+        decoded = (op, (modes[0], modes[1], modes[2]))
+        _DECODE_CACHE[word] = decoded
+        return decoded
+
+
+Decoder = Callable[[int], Tuple[OP, Tuple[int, int, int]]]
+
+# opcode sets of the machine as it grew over the 2019 puzzles
+PROFILES: Dict[str, FrozenSet[OP]] = {
+    "day2": frozenset({OP.ADD, OP.MULT, OP.HALT}),
+    "day5": frozenset(op for op in OP if op != OP.UDATE_REL_BASE),
+    "day9": frozenset(OP),
+}
+
+
+def _profile_decoder(ops: FrozenSet[OP]) -> Decoder:
+    # like _decode, but words whose opcode is not in ops raise ValueError
+    # instead of decoding as HALT. Only valid words are cached, so the check
+    # costs nothing once a word has been seen.
+    codes = {op.code for op in ops}
+    cache: Dict[int, Tuple[OP, Tuple[int, int, int]]] = {}
+
+    def decode(word: int) -> Tuple[OP, Tuple[int, int, int]]:
+        try:
+            return cache[word]
+        except KeyError:
+            if word % 100 not in codes:
+                raise ValueError(f"Unknown opcode {word}")
+            decoded = cache[word] = _decode(word)
+            return decoded
+
+    return decode
+
+
+_DECODERS: Dict[str, Decoder] = {
+    name: _profile_decoder(ops) for name, ops in PROFILES.items()
+}
+
+
+class Memory:
+    """Intcode memory: a dense list from address 0 plus a sparse dict.
+
+    Unset addresses read as 0, like the dict memories the solvers used to
+    build. Writes at most grow_limit past the end of the dense list grow it;
+    anything further away (or negative) goes to the sparse dict. Cells are
+    plain Python ints, so values that overflow 64 bits need no special path.
+
+    fork() shares the storage between both copies until one of them writes
+    (or an engine claims it with own()), which then copies it. writes counts
+    the writes made through this object, so the compiled and native engines
+    can tell when memory changed behind their backs.
+    """
+
+    __slots__ = ("dense", "sparse", "grow_limit", "writes", "_refs")
+
+    def __init__(self, image: Iterable[int] = (), grow_limit: int = 4096) -> None:
+        self.dense: List[int] = list(image)
+        self.sparse: Dict[int, int] = {}
+        self.grow_limit = grow_limit
+        self.writes = 0
+        # number of Memory objects sharing dense/sparse, shared between them
+        self._refs = [1]
+
+    @classmethod
+    def wrap(cls, mem: "Memory | dict[int, int] | list[int]") -> "Memory":
+        # a list becomes the dense store and a dict the sparse store as-is,
+        # so writes still land in the caller's container
+        if isinstance(mem, Memory):
+            return mem
+        if isinstance(mem, list):
+            wrapped = cls()
+            wrapped.dense = mem
+            return wrapped
+        wrapped = cls(grow_limit=0)
+        wrapped.sparse = mem
+        return wrapped
+
+    def get(self, addr: int, default: int = 0) -> int:
+        dense = self.dense
+        if 0 <= addr < len(dense):
+            return dense[addr]
+        return self.sparse.get(addr, default)
+
+    def __getitem__(self, addr: int) -> int:
+        return self.get(addr)
+
+    def __setitem__(self, addr: int, val: int) -> None:
+        self.writes += 1
+        if self._refs[0] > 1:
+            self.own()
+        dense = self.dense
+        size = len(dense)
+        if 0 <= addr < size:
+            dense[addr] = val
+        elif size <= addr < size + self.grow_limit:
+            sparse = self.sparse
+            if sparse:
+                dense.extend(sparse.pop(a, 0) for a in range(size, addr))
+                sparse.pop(addr, None)
+            else:
+                dense.extend([0] * (addr - size))
+            dense.append(val)
+        else:
+            self.sparse[addr] = val
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        yield from enumerate(self.dense)
+        yield from self.sparse.items()
+
+    def copy(self) -> "Memory":
+        mem = Memory(self.dense, self.grow_limit)
+        mem.sparse = dict(self.sparse)
+        return mem
+
+    def fork(self) -> "Memory":
+        mem = Memory(grow_limit=self.grow_limit)
+        mem.dense, mem.sparse = self.dense, self.sparse
+        self._refs[0] += 1
+        mem._refs = self._refs
+        return mem
+
+    def own(self) -> None:
+        refs = self._refs
+        if refs[0] > 1:
+            refs[0] -= 1
+            self.dense = list(self.dense)
+            self.sparse = dict(self.sparse)
+            self._refs = [1]
+
+    def __repr__(self) -> str:
+        return f"Memory({self.dense!r}, sparse={self.sparse!r})"
+
+
 def run_intcode(
-    mem: dict[int, int],
+    mem: Memory | dict[int, int] | list[int],
     in_f: Callable[[], int] = (lambda: int(input("input> "))),
     out_f: Callable[[int], None] = print,
+    engine: str = "interp",
+    profile: str = "day9",
 ) -> None:
-    ip = 0
-    rel_base = 0
-
-    def next_mem() -> int:
-        nonlocal ip
-        val = mem.get(ip, 0)
-        ip += 1
-        return val
-
-    def param_read(mode, val) -> int:
-        if mode == 0:
-            return mem.get(val, 0)
-        elif mode == 1:
-            return val
-        elif mode == 2:
-            return mem.get(rel_base + val, 0)
-        else:
-            raise RuntimeError(f"Invalid parameter mode: {mode}")
+    IntcodeVM(mem, engine, profile).run(in_f, out_f)
 
-    def addr_write(mode, val) -> int:
-        if mode == 2:
-            return rel_base + val
-        else:
+
+class IntcodeVM:
+    """A resumable Intcode machine.
+
+    All state lives on the object, so run() can stop when the program asks for
+    input that has not been sent yet, after a number of outputs or after a
+    number of steps, and pick up again later. Outputs go to out_f when one is
+    given and are queued on self.outputs otherwise. fork() copies the machine
+    cheaply: memory is shared until either copy runs.
+
+    engine picks the run loop from ENGINES. The compiled engine checks
+    budgets between blocks, so max_steps can overshoot by up to a block. The
+    native engine runs a C kernel (see IntCodeNative) and falls back to the
+    interpreter where it cannot.
+    profile picks the opcode set from PROFILES; reaching an opcode outside it
+    raises RuntimeError. mem can be a Memory, or a list or dict that is
+    used in place.
+    """
+
+    def __init__(
+        self,
+        mem: Memory | dict[int, int] | list[int],
+        engine: str = "interp",
+        profile: str = "day9",
+    ) -> None:
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine {engine!r}, expected one of {list(ENGINES)}"
+            )
+        if profile not in PROFILES:
+            raise ValueError(
+                f"Unknown profile {profile!r}, expected one of {list(PROFILES)}"
+            )
+        self.engine = engine
+        self.profile = profile
+        self._decoder = _DECODERS[profile]
+        self.mem = Memory.wrap(mem)
+        self.ip = 0
+        self.rel_base = 0
+        self.halted = False
+        self.inputs: Deque[int] = deque()
+        self.outputs: Deque[int] = deque()
+        self._translation: Optional[_Translation] = None
+        self._image: Optional["NativeImage"] = None
+
+    def send(self, *values: int) -> None:
+        self.inputs.extend(values)
+
+    @property
+    def waiting(self) -> bool:
+        return (
+            not self.halted
+            and not self.inputs
+            and _decode(self.mem.get(self.ip))[0] == OP.IN
+        )
+
+    def fork(self) -> "IntcodeVM":
+        vm = IntcodeVM(self.mem.fork(), self.engine, self.profile)
+        vm.ip = self.ip
+        vm.rel_base = self.rel_base
+        vm.halted = self.halted
+        vm.inputs = deque(self.inputs)
+        vm.outputs = deque(self.outputs)
+        return vm
+
+    def step(self) -> OP:
+        op, _ = _decode(self.mem.get(self.ip))
+        if self.halted:
+            return OP.HALT
+        if op == OP.IN and not self.inputs:
+            raise RuntimeError(f"No input queued at ip={self.ip}")
+        # always interpreted so a step is exactly one instruction; the
+        # interpreter does not invalidate translated blocks or the native
+        # engine's memory image, so drop them
+        self._translation = None
+        self._image = None
+        self.mem.own()
+        self._run_interp(None, self.outputs.append, 1, None)
+        return op
+
+    def run_until_input(self) -> List[int]:
+        self.run()
+        outputs = list(self.outputs)
+        self.outputs.clear()
+        return outputs
+
+    def run_until_output(self) -> Optional[int]:
+        if not self.outputs:
+            self.run(max_outputs=1)
+        return self.outputs.popleft() if self.outputs else None
+
+    def run_until_outputs(self, n: int) -> Optional[List[int]]:
+        outputs = self.outputs
+        if len(outputs) < n:
+            self.run(max_outputs=n - len(outputs))
+        if len(outputs) < n:
+            return None
+        return [outputs.popleft() for _ in range(n)]
+
+    def coroutine(self, n: int = 1) -> Generator[Optional[List[int]], Optional[int], None]:
+        """Yield outputs in chunks of n, or None when the program needs input.
+
+        Input can be queued with send() on the VM or passed to send() on the
+        generator. The generator finishes when the program halts; a trailing
+        partial chunk stays on self.outputs.
+        """
+        while True:
+            chunk = self.run_until_outputs(n)
+            if chunk is None and self.halted:
+                return
+            value = yield chunk
+            if value is not None:
+                self.send(value)
+
+    def run(
+        self,
+        in_f: Optional[Callable[[], int]] = None,
+        out_f: Optional[Callable[[int], None]] = None,
+        max_steps: Optional[int] = None,
+        max_outputs: Optional[int] = None,
+    ) -> None:
+        if self.halted:
+            return
+        self.mem.own()
+        out = self.outputs.append if out_f is None else out_f
+        ENGINES[self.engine](self, in_f, out, max_steps, max_outputs)
+
+    def _run_interp(
+        self,
+        in_f: Optional[Callable[[], int]],
+        out: Callable[[int], None],
+        max_steps: Optional[int],
+        max_outputs: Optional[int],
+    ) -> None:
+        mem = self.mem
+        dense, sparse = mem.dense, mem.sparse
+        inputs = self.inputs
+        decode = self._decoder
+        ip = self.ip
+        rel_base = self.rel_base
+        steps_left = -1 if max_steps is None else max_steps
+        outputs_left = -1 if max_outputs is None else max_outputs
+
+        def read(addr: int) -> int:
+            if 0 <= addr < len(dense):
+                return dense[addr]
+            return sparse.get(addr, 0)
+
+        def next_mem() -> int:
+            nonlocal ip
+            val = read(ip)
+            ip += 1
             return val
 
-    while True:
+        def param_read(mode, val) -> int:
+            if mode == 0:
+                return read(val)
+            elif mode == 1:
+                return val
+            elif mode == 2:
+                return read(rel_base + val)
+            else:
+                raise RuntimeError(f"Invalid parameter mode: {mode}")
+
+        def addr_write(mode, val) -> int:
+            if mode == 2:
+                return rel_base + val
+            else:
+                return val
+
+        def write(addr: int, val: int) -> None:
+            # run() already made the storage private; going straight to the
+            # list also keeps these writes out of mem.writes
+            if 0 <= addr < len(dense):
+                dense[addr] = val
+            else:
+                mem[addr] = val
+
+        try:
+            while steps_left != 0:
+                steps_left -= 1
+                at = ip
+                try:
+                    op, modes = decode(next_mem())
+                except ValueError as e:
+                    ip = at
+                    raise RuntimeError(f"{e} at ip={at}") from None
+
+                args = [next_mem() for _ in range(op.args)]
+
+                if op == OP.ADD:
+                    a = param_read(modes[0], args[0])
+                    b = param_read(modes[1], args[1])
+                    out_addr = addr_write(modes[2], args[2])
+                    write(out_addr, a + b)
+
+                elif op == OP.MULT:
+                    a = param_read(modes[0], args[0])
+                    b = param_read(modes[1], args[1])
+                    out_addr = addr_write(modes[2], args[2])
+                    write(out_addr, a * b)
+
+                elif op == OP.IN:
+                    if inputs:
+                        val = inputs.popleft()
+                    elif in_f is not None:
+                        val = in_f()
+                    else:
+                        ip = at
+                        return
+                    out_addr = addr_write(modes[0], args[0])
+                    write(out_addr, val)
+
+                elif op == OP.OUT:
+                    val = param_read(modes[0], args[0])
+                    out(val)
+                    outputs_left -= 1
+                    if outputs_left == 0:
+                        return
+
+                elif op == OP.JUMP_TRUE:
+                    val = param_read(modes[0], args[0])
+                    if val != 0:
+                        ip = param_read(modes[1], args[1])
+
+                elif op == OP.JUMP_FALSE:
+                    val = param_read(modes[0], args[0])
+                    if val == 0:
+                        ip = param_read(modes[1], args[1])
+
+                elif op == OP.LESS_THAN:
+                    a = param_read(modes[0], args[0])
+                    b = param_read(modes[1], args[1])
+                    out_addr = addr_write(modes[2], args[2])
+                    write(out_addr, 1 if a < b else 0)
+
+                elif op == OP.EQUALS:
+                    a = param_read(modes[0], args[0])
+                    b = param_read(modes[1], args[1])
+                    out_addr = addr_write(modes[2], args[2])
+                    write(out_addr, 1 if a == b else 0)
+
+                elif op == OP.UDATE_REL_BASE:
+                    rel_base = rel_base + param_read(modes[0], args[0])
+
+                elif op == OP.HALT:
+                    ip = at
+                    self.halted = True
+                    return
+
+                else:
+                    raise RuntimeError(f"Unexpected op {op} at ip={ip}")
+        finally:
+            self.ip = ip
+            self.rel_base = rel_base
+
+    def _run_native(
+        self,
+        in_f: Optional[Callable[[], int]],
+        out: Callable[[int], None],
+        max_steps: Optional[int],
+        max_outputs: Optional[int],
+    ) -> None:
+        # imported here because IntCodeNative builds on this module
+        from IntCodeNative import run_native
+
+        run_native(self, in_f, out, max_steps, max_outputs)
+
+    def _run_compiled(
+        self,
+        in_f: Optional[Callable[[], int]],
+        out: Callable[[int], None],
+        max_steps: Optional[int],
+        max_outputs: Optional[int],
+    ) -> None:
+        tr = self._translation
+        mem = self.mem
+        if tr is None or tr.dense is not mem.dense or tr.writes != mem.writes:
+            # first run, own() gave this VM a private copy after a fork, or
+            # memory was written since the last run and may hold new code
+            tr = self._translation = _Translation(self)
+        blocks = tr.blocks
+        translate = tr.translate
+        env = tr.env
+        env["in_f"] = in_f
+        ip = next_ip = self.ip
+        rb = self.rel_base
+        halted = False
+
         try:
-            op, modes = _parse_op(next_mem())
-        except IndexError:
-            raise RuntimeError(f"Instruction pointer out of bounds: ip={ip}")
+            if max_steps is None and max_outputs is None:
+                env["out"] = out
+                env["spins"] = _LOOP_SPINS
+                while next_ip is not None:
+                    ip = next_ip
+                    block = blocks.get(ip)
+                    if block is None:
+                        block = translate(ip)
+                    next_ip, rb = block(rb)
+            else:
+                lengths = tr.lengths
+                looping = tr.looping
+                spun = tr.spun
+                steps_left = _LOOP_SPINS if max_steps is None else max_steps
+                outputs_left = -1 if max_outputs is None else max_outputs
+
+                def counted_out(val: int) -> None:
+                    nonlocal outputs_left
+                    outputs_left -= 1
+                    out(val)
+
+                env["out"] = out if max_outputs is None else counted_out
+                while next_ip is not None and steps_left > 0 and outputs_left != 0:
+                    ip = next_ip
+                    block = blocks.get(ip)
+                    if block is None:
+                        block = translate(ip)
+                    n = lengths[ip]
+                    if ip in looping:
+                        # enough spins to use up the budget, and no more
+                        env["spins"] = steps_left // n + 1
+                        next_ip, rb = block(rb)
+                        steps_left -= n * (spun[0] + 1)
+                    else:
+                        steps_left -= n
+                        next_ip, rb = block(rb)
+        except _Halt as stop:
+            halted, next_ip, rb = True, None, stop.rb
+        finally:
+            self.ip = ip if next_ip is None else next_ip
+            self.rel_base = rb
+            env["in_f"] = env["out"] = None
+            tr.writes = mem.writes
+        self.halted = halted
+
+
+# Compiled engine: each block of straight-line code is translated once into a
+# Python function with its operands and modes baked in. A block takes the
+# relative base and returns (next_ip, rel_base), or (None, rel_base) when it
+# needs input that has not been sent; it raises _Halt on halt, so any int it
+# returns, negative or not, is an address to go on from. It ends after a taken jump or
+# an output, before an input or halt that is not its first instruction, or
+# after _MAX_BLOCK instructions, so the VM can stop between blocks on halt,
+# missing input or an output budget. Every write checks whether it landed on
+# translated code and, if so, drops the affected blocks and returns so the VM
+# re-translates from the following instruction. in_f and out are user code that
+# can write to memory too: when mem.writes moved across the call, the block
+# drops every translated block and returns. Position operands inside the
+# dense part of Memory at translation time index the list directly; the dense
+# part never shrinks, so those stay valid. Addresses that have been patched
+# are "volatile": later translations read operands stored there from memory
+# instead of baking them in, so programs that patch their own operands on
+# every call only re-translate once.
+
+_MAX_BLOCK = 64
+
+# Superinstructions: with _FUSE on, translation also
+# - turns a block whose jump goes back to its own start into a loop inside
+#   the block function, so a hot loop no longer returns to the dispatcher on
+#   every iteration. The loop runs at most `spins` times per call and
+#   leaves the number of full iterations before the last one in spun[0];
+#   runs with a step budget size spins from what is left of it, so they
+#   overshoot by at most a block as without fusion.
+# - folds immediate rel-base adjustments into the relative addresses that
+#   follow them, only updating rb when the block exits or loops.
+# - keeps the result of a compare that is immediately tested by a jump in a
+#   local instead of reading it back from memory.
+# Benchmarks switch it off to measure plain block translation.
+_FUSE = True
+_LOOP_SPINS = 1 << 62
+
+Block = Callable[[int], Tuple[Optional[int], int]]
+
 
-        args = [next_mem() for _ in range(op.args)]
+class _Halt(Exception):
+    """Raised by a block that reached a halt, with the final rel base."""
 
-        if op == OP.ADD:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = a + b
+    def __init__(self, rb: int) -> None:
+        self.rb = rb
 
-        elif op == OP.MULT:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = a * b
+
+def _bad_mode(mode: int) -> int:
+    # stands in for an operand with an invalid mode, so the error is only
+    # raised if the operand is actually read, as in the interpreter
+    raise RuntimeError(f"Invalid parameter mode: {mode}")
+
+
+def _block_name(start: int) -> str:
+    # blocks can start at negative addresses too
+    return f"_block_{start}" if start >= 0 else f"_block_m{-start}"
+
+
+def _rel_expr(val: int | str, rb_off: int) -> str:
+    # address of a relative operand while rb_off is pending on rb
+    if isinstance(val, int):
+        return f"rb + {val + rb_off}"
+    return f"rb + {rb_off} + {val}" if rb_off else f"rb + {val}"
+
+
+def _read_expr(mode: int, val: int | str, size: int, rb_off: int = 0) -> str:
+    # val is baked in when it is an int and a volatile operand expression otherwise
+    if mode == 0:
+        if isinstance(val, int) and 0 <= val < size:
+            return f"d[{val}]"
+        return f"(d[x] if 0 <= (x := {val}) < len(d) else sget(x, 0))"
+    elif mode == 1:
+        return f"({val})"
+    elif mode == 2:
+        rel = _rel_expr(val, rb_off)
+        return f"(d[x] if 0 <= (x := {rel}) < len(d) else sget(x, 0))"
+    else:
+        return f"bad_mode({mode})"
+
+
+def _write_lines(
+    mode: int, val: int | str, size: int, expr: str, rb_off: int = 0
+) -> List[str]:
+    if mode != 2 and isinstance(val, int) and 0 <= val < size:
+        return [f"a = {val}", f"d[a] = {expr}"]
+    target = _rel_expr(val, rb_off) if mode == 2 else f"{val}"
+    return [
+        f"a = {target}",
+        "if 0 <= a < len(d):",
+        f"    d[a] = {expr}",
+        "else:",
+        f"    mem[a] = {expr}",
+    ]
+
+
+def _translate_block(
+    mem: Memory, start: int, volatile: Set[int], decode: Decoder
+) -> Tuple[str, List[int], int, bool]:
+    lines: List[str] = []
+    covered: List[int] = []
+    size = len(mem.dense)
+    ip = start
+    count = 0
+    looped = False
+    # immediate rel-base adjustments not yet applied to rb
+    rb_off = 0
+    # ("pos" | "rel", operand) the previous instruction's compare wrote to
+    flag: Optional[Tuple[str, int]] = None
+
+    def rb_now() -> str:
+        return f"rb + {rb_off}" if rb_off else "rb"
+
+    def leave(target: int | str) -> str:
+        # jumping back to the start of the block loops instead of returning
+        nonlocal looped
+        if _FUSE and target == f"({start})":
+            looped = True
+            return f"rb = {rb_now()}; continue" if rb_off else "continue"
+        return f"return {target}, {rb_now()}"
+
+    def emit_write(mode: int, val: int | str, expr: str) -> None:
+        lines.extend(_write_lines(mode, val, size, expr, rb_off))
+        lines.append("if a in code:")
+        lines.append(f"    return invalidate(a, {ip}, {rb_now()})")
+
+    for count in range(1, _MAX_BLOCK + 1):
+        try:
+            op, modes = decode(mem.get(ip, 0))
+        except ValueError as e:
+            # like invalid modes, only an error once the instruction is reached
+            covered.append(ip)
+            lines.append(f"raise RuntimeError({f'{e} at ip={ip}'!r})")
+            break
+        if count > 1 and (op == OP.IN or op == OP.HALT):
+            lines.append(f"return {ip}, {rb_now()}")
+            count -= 1
+            break
+        addrs = range(ip + 1, ip + 1 + op.args)
+        args: List[int | str] = [
+            f"get({a})" if a in volatile else mem.get(a, 0) for a in addrs
+        ]
+        covered.append(ip)
+        covered.extend(a for a in addrs if a not in volatile)
+        ip += 1 + op.args
+        prev_flag, flag = flag, None
+        if op == OP.ADD or op == OP.MULT:
+            sign = "+" if op == OP.ADD else "*"
+            a = _read_expr(modes[0], args[0], size, rb_off)
+            b = _read_expr(modes[1], args[1], size, rb_off)
+            emit_write(modes[2], args[2], f"{a} {sign} {b}")
+
+        elif op == OP.LESS_THAN or op == OP.EQUALS:
+            cmp = "<" if op == OP.LESS_THAN else "=="
+            a = _read_expr(modes[0], args[0], size, rb_off)
+            b = _read_expr(modes[1], args[1], size, rb_off)
+            if _FUSE and isinstance(args[2], int):
+                lines.append(f"c = {a} {cmp} {b}")
+                emit_write(modes[2], args[2], "1 if c else 0")
+                flag = ("rel" if modes[2] == 2 else "pos", args[2])
+            else:
+                emit_write(modes[2], args[2], f"1 if {a} {cmp} {b} else 0")
 
         elif op == OP.IN:
-            val = in_f()
-            out_addr = addr_write(modes[0], args[0])
-            mem[out_addr] = val
+            lines.append("if inputs:")
+            lines.append("    v = inputs.popleft()")
+            lines.append("elif in_f is not None:")
+            lines.append("    w = mem.writes")
+            lines.append("    v = in_f()")
+            lines.append("    if mem.writes != w:")
+            lines.extend(
+                f"        {line}"
+                for line in _write_lines(modes[0], args[0], size, "v", rb_off)
+            )
+            lines.append(f"        return reset({ip}, {rb_now()})")
+            lines.append("else:")
+            lines.append(f"    return None, {rb_now()}")
+            emit_write(modes[0], args[0], "v")
 
         elif op == OP.OUT:
-            val = param_read(modes[0], args[0])
-            out_f(val)
-
-        elif op == OP.JUMP_TRUE:
-            val = param_read(modes[0], args[0])
-            if val != 0:
-                ip = param_read(modes[1], args[1])
-
-        elif op == OP.JUMP_FALSE:
-            val = param_read(modes[0], args[0])
-            if val == 0:
-                ip = param_read(modes[1], args[1])
-
-        elif op == OP.LESS_THAN:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = 1 if a < b else 0
-
-        elif op == OP.EQUALS:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = 1 if a == b else 0
+            lines.append("w = mem.writes")
+            lines.append(f"out({_read_expr(modes[0], args[0], size, rb_off)})")
+            lines.append("if mem.writes != w:")
+            lines.append(f"    return reset({ip}, {rb_now()})")
+            lines.append(f"return {ip}, {rb_now()}")
+            break
+
+        elif op == OP.JUMP_TRUE or op == OP.JUMP_FALSE:
+            target = _read_expr(modes[1], args[1], size, rb_off)
+            if modes[0] == 1 and isinstance(args[0], int):
+                if (args[0] != 0) == (op == OP.JUMP_TRUE):
+                    lines.append(leave(target))
+                    break
+            else:
+                kind = {0: "pos", 2: "rel"}.get(modes[0])
+                if prev_flag is not None and prev_flag == (kind, args[0]):
+                    # the compare just before wrote this operand
+                    cond = "c" if op == OP.JUMP_TRUE else "not c"
+                else:
+                    cmp = "!=" if op == OP.JUMP_TRUE else "=="
+                    val = _read_expr(modes[0], args[0], size, rb_off)
+                    cond = f"{val} {cmp} 0"
+                lines.append(f"if {cond}:")
+                lines.append(f"    {leave(target)}")
 
         elif op == OP.UDATE_REL_BASE:
-            rel_base = rel_base + param_read(modes[0], args[0])
+            if _FUSE and modes[0] == 1 and isinstance(args[0], int):
+                rb_off += args[0]
+            else:
+                val = _read_expr(modes[0], args[0], size, rb_off)
+                lines.append(f"rb = {rb_now()} + {val}")
+                rb_off = 0
+
+        else:  # OP.HALT
+            lines.append(f"raise Halt({rb_now()})")
+            break
+    else:
+        lines.append(leave(f"({ip})"))
+
+    if looped:
+        lines = [
+            "try:",
+            "    for _ in range(spins):",
+            *(f"        {line}" for line in lines),
+            f"    return {start}, rb",
+            "finally:",
+            "    spun[0] = _",
+        ]
+    body = "\n".join(f"    {line}" for line in lines)
+    source = (
+        f"def {_block_name(start)}(rb, d=d, sget=sget, get=get, mem=mem, code=code, "
+        f"invalidate=invalidate, reset=reset, inputs=inputs, spun=spun):\n{body}\n"
+    )
+    return source, covered, count, looped
 
-        elif op == OP.HALT:
-            return
 
+class _Translation:
+    """Blocks the compiled engine translated from one VM's memory."""
+
+    def __init__(self, vm: IntcodeVM) -> None:
+        mem = vm.mem
+        self.mem = mem
+        self.dense = mem.dense
+        self.decode = vm._decoder
+        # mem.writes when the engine last stopped; any other value means
+        # something else wrote to memory and the blocks may be stale
+        self.writes = mem.writes
+        self.blocks: Dict[int, Block] = {}
+        # block start -> number of instructions in the block
+        self.lengths: Dict[int, int] = {}
+        # starts of the blocks fused into loops, and where they leave the
+        # number of iterations they ran
+        self.looping: Set[int] = set()
+        self.spun = [0]
+        # code address -> start of every translated block covering it
+        self.code: Dict[int, Set[int]] = {}
+        self.volatile: Set[int] = set()
+        # in_f, out and spins are looked up as globals so each run can set them
+        self.env = {
+            "d": mem.dense,
+            "sget": mem.sparse.get,
+            "get": mem.get,
+            "mem": mem,
+            "code": self.code,
+            "invalidate": self.invalidate,
+            "reset": self.reset,
+            "inputs": vm.inputs,
+            "in_f": None,
+            "out": None,
+            "spins": 1,
+            "spun": self.spun,
+            "Halt": _Halt,
+            "bad_mode": _bad_mode,
+        }
+
+    def invalidate(self, addr: int, next_ip: int, rb: int) -> Tuple[int, int]:
+        self.volatile.add(addr)
+        for start in self.code.pop(addr, ()):
+            self.blocks.pop(start, None)
+        return next_ip, rb
+
+    def reset(self, next_ip: int, rb: int) -> Tuple[int, int]:
+        # in_f or out wrote to memory mid-run, so any block may be stale
+        self.blocks.clear()
+        self.code.clear()
+        self.looping.clear()
+        return next_ip, rb
+
+    def translate(self, start: int) -> Block:
+        source, covered, length, looped = _translate_block(
+            self.mem, start, self.volatile, self.decode
+        )
+        exec(source, self.env)
+        for addr in covered:
+            self.code.setdefault(addr, set()).add(start)
+        block = self.blocks[start] = self.env[_block_name(start)]
+        self.lengths[start] = length
+        if looped:
+            self.looping.add(start)
         else:
-            raise RuntimeError(f"Unexpected op {op} at ip={ip}")
+            self.looping.discard(start)
+        return block
+
+
+ENGINES: Dict[str, Callable[..., None]] = {
+    "interp": IntcodeVM._run_interp,
+    "compiled": IntcodeVM._run_compiled,
+    "native": IntcodeVM._run_native,
+}
@@ -0,0 +1,90 @@
+"""Shared loader for Intcode program files.
+
+The first load of a file parses its text and writes a binary image next to
+it (input.txt -> input.txt.intcode): a header holding the SHA-256 of the text
+followed by the cells as native int64s. Later loads only hash the text and,
+if the digest still matches, memory-map the image instead of parsing. Images
+are rewritten whenever the text changes, and programs with cells that do not
+fit in 64 bits are simply never cached.
+"""
+
+import hashlib
+import mmap
+import os
+import pathlib
+import struct
+from array import array
+from typing import List, Optional
+
+from IntCode import Memory
+
+# magic, SHA-256 of the source text, number of cells
+_HEADER = struct.Struct("=4s32sq")
+_MAGIC = b"ICB1"
+
+
+def parse_program(text: str) -> List[int]:
+    try:
+        # int() ignores the whitespace around each value
+        return list(map(int, text.split(",")))
+    except ValueError:
+        # blank lines, a trailing comma or newline-separated values
+        parts = text.replace("\n", ",").split(",")
+        return [int(p) for p in parts if p.strip()]
+
+
+def cache_path(path: str | os.PathLike) -> pathlib.Path:
+    path = pathlib.Path(path)
+    return path.with_name(path.name + ".intcode")
+
+
+def _read_image(cache: pathlib.Path, digest: bytes) -> Optional[List[int]]:
+    try:
+        with open(cache, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            if len(mm) < _HEADER.size:
+                return None
+            magic, stored, count = _HEADER.unpack_from(mm)
+            if magic != _MAGIC or stored != digest:
+                return None
+            if len(mm) != _HEADER.size + 8 * count:
+                return None
+            with memoryview(mm) as view:
+                with view[_HEADER.size :].cast("q") as cells:
+                    return cells.tolist()
+    except (OSError, ValueError):
+        return None
+
+
+def _write_image(cache: pathlib.Path, digest: bytes, program: List[int]) -> None:
+    try:
+        cells = array("q", program)
+    except OverflowError:
+        return
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, digest, len(cells)))
+            cells.tofile(f)
+        tmp.replace(cache)
+    except OSError:
+        # read-only checkout: loading still works, just without the cache
+        tmp.unlink(missing_ok=True)
+
+
+def load_program(path: str | os.PathLike) -> List[int]:
+    """Cells of the Intcode program in path, via the binary image when valid."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).digest()
+    cache = cache_path(path)
+    program = _read_image(cache, digest)
+    if program is None:
+        program = parse_program(raw.decode("utf-8"))
+        _write_image(cache, digest, program)
+    return program
+
+
+def load_memory(path: str | os.PathLike) -> Memory:
+    return Memory(load_program(path))
@@ -0,0 +1,418 @@
+"""Native Intcode backend: a small C kernel built with the system compiler.
+
+The kernel is compiled on first use with cc into .native/ next to this file,
+named by a hash of its source, and loaded with ctypes. The VM keeps an int64
+image of its memory between runs; it is rebuilt only when something wrote to
+the Memory from outside (Memory.writes moved) or own() replaced its storage.
+Each run lets the kernel execute until it halts, needs input, fills its
+output buffer or runs out of steps, then copies the pages it wrote back into
+the Memory and hands over the outputs. Queued inputs are passed in one batch,
+so Python is only called back when the kernel runs out of them. Outputs for
+the VM's own queue are buffered; an out_f callback gets each one as it is
+produced, since like in_f it may write to memory, after which the image is
+rebuilt.
+
+Anything the kernel cannot do with int64 cells (an overflowing result, a
+value that does not fit, a negative address) or that should raise (an
+invalid opcode or mode) makes it stop before the instruction, and the rest of
+the run continues in the Python interpreter. Without a working compiler every
+run uses the interpreter.
+"""
+
+import ctypes
+import hashlib
+import os
+import pathlib
+import subprocess
+import tempfile
+from array import array
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from IntCode import OP, PROFILES, Memory
+
+if TYPE_CHECKING:
+    from IntCode import IntcodeVM
+
+KERNEL = r"""
+#include <stdint.h>
+
+enum { HALTED, NEED_INPUT, OUTPUT_FULL, OUT_OF_STEPS, GROW, FALLBACK };
+
+#define PAGE_BITS 4
+
+static int read_param(const int64_t *mem, int64_t size, int64_t rb, int mode,
+                      int64_t raw, int64_t *val)
+{
+    int64_t addr;
+    if (mode == 1) {
+        *val = raw;
+        return 1;
+    }
+    if (mode == 0)
+        addr = raw;
+    else if (mode != 2 || __builtin_add_overflow(rb, raw, &addr))
+        return 0;
+    if (addr < 0)
+        return 0;
+    *val = addr < size ? mem[addr] : 0;
+    return 1;
+}
+
+static int write_addr(int64_t rb, int mode, int64_t raw, int64_t *addr)
+{
+    if (mode == 2) {
+        if (__builtin_add_overflow(rb, raw, addr))
+            return 0;
+    } else {
+        *addr = raw;
+    }
+    return *addr >= 0;
+}
+
+/* state: ip, rel_base, steps left (negative for no limit), inputs used,
+   outputs written, address to grow to, pages logged. A write to a page whose
+   dirty flag is clear sets it and appends the page to pages. Returns why it
+   stopped; on GROW and FALLBACK the instruction at ip has not been executed. */
+int intcode_run(int64_t *mem, int64_t size, int64_t *state, const int64_t *in,
+                int64_t n_in, int64_t *out, int64_t out_cap, uint8_t *dirty,
+                int64_t *pages, int64_t allowed)
+{
+    int64_t ip = state[0], rb = state[1], steps = state[2];
+    int64_t in_used = 0, n_out = 0, n_pages = state[6];
+    int status;
+
+#define CELL(a) ((a) < size ? mem[a] : 0)
+#define FAIL(s) do { status = (s); goto stop; } while (0)
+#define MARK(a) do { \
+        int64_t page_ = (a) >> PAGE_BITS; \
+        if (!dirty[page_]) { \
+            dirty[page_] = 1; \
+            pages[n_pages++] = page_; \
+        } \
+    } while (0)
+
+    for (;;) {
+        int64_t word, a, b, dst, r;
+        int op, m1, m2, m3;
+
+        if (steps == 0)
+            FAIL(OUT_OF_STEPS);
+        if (ip < 0 || (word = CELL(ip)) < 0)
+            FAIL(FALLBACK);
+        op = word % 100;
+        if (op == 99)
+            FAIL(HALTED);
+        if (op < 1 || op > 9 || !((allowed >> op) & 1))
+            FAIL(FALLBACK);
+        m1 = word / 100 % 10;
+        m2 = word / 1000 % 10;
+        m3 = word / 10000 % 10;
+
+        switch (op) {
+        case 1: case 2: case 7: case 8:
+            if (!read_param(mem, size, rb, m1, CELL(ip + 1), &a)
+                || !read_param(mem, size, rb, m2, CELL(ip + 2), &b)
+                || !write_addr(rb, m3, CELL(ip + 3), &dst))
+                FAIL(FALLBACK);
+            if (dst >= size) {
+                state[5] = dst;
+                FAIL(GROW);
+            }
+            if (op == 1) {
+                if (__builtin_add_overflow(a, b, &r))
+                    FAIL(FALLBACK);
+            } else if (op == 2) {
+                if (__builtin_mul_overflow(a, b, &r))
+                    FAIL(FALLBACK);
+            } else {
+                r = op == 7 ? a < b : a == b;
+            }
+            mem[dst] = r;
+            MARK(dst);
+            ip += 4;
+            break;
+        case 3:
+            if (in_used == n_in)
+                FAIL(NEED_INPUT);
+            if (!write_addr(rb, m1, CELL(ip + 1), &dst))
+                FAIL(FALLBACK);
+            if (dst >= size) {
+                state[5] = dst;
+                FAIL(GROW);
+            }
+            mem[dst] = in[in_used++];
+            MARK(dst);
+            ip += 2;
+            break;
+        case 4:
+            if (!read_param(mem, size, rb, m1, CELL(ip + 1), &a))
+                FAIL(FALLBACK);
+            out[n_out++] = a;
+            ip += 2;
+            if (steps > 0)
+                steps--;
+            if (n_out == out_cap)
+                FAIL(OUTPUT_FULL);
+            continue;
+        case 5: case 6:
+            if (!read_param(mem, size, rb, m1, CELL(ip + 1), &a)
+                || !read_param(mem, size, rb, m2, CELL(ip + 2), &b))
+                FAIL(FALLBACK);
+            ip = (a != 0) == (op == 5) ? b : ip + 3;
+            break;
+        case 9:
+            if (!read_param(mem, size, rb, m1, CELL(ip + 1), &a)
+                || __builtin_add_overflow(rb, a, &rb))
+                FAIL(FALLBACK);
+            ip += 2;
+            break;
+        }
+        if (steps > 0)
+            steps--;
+    }
+
+stop:
+    state[0] = ip;
+    state[1] = rb;
+    state[2] = steps;
+    state[3] = in_used;
+    state[4] = n_out;
+    state[6] = n_pages;
+    return status;
+}
+"""
+
+HALTED, NEED_INPUT, OUTPUT_FULL, OUT_OF_STEPS, GROW, FALLBACK = range(6)
+PAGE_BITS = 4
+# outputs buffered per call into the kernel
+OUT_CHUNK = 4096
+# largest memory the kernel gets; programs reaching further use the interpreter
+MAX_CELLS = 1 << 24
+
+BUILD_DIR = pathlib.Path(__file__).parent / ".native"
+
+_library: Optional[ctypes.CDLL] = None
+_build_failed = False
+
+
+def _build() -> Optional[ctypes.CDLL]:
+    digest = hashlib.sha256(KERNEL.encode()).hexdigest()[:16]
+    path = BUILD_DIR / f"intcode_{digest}.so"
+    if not path.exists():
+        BUILD_DIR.mkdir(exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=BUILD_DIR) as tmp:
+            source = pathlib.Path(tmp) / "intcode.c"
+            source.write_text(KERNEL, encoding="utf-8")
+            target = pathlib.Path(tmp) / path.name
+            cc = os.environ.get("CC", "cc")
+            subprocess.run(
+                [cc, "-O2", "-shared", "-fPIC", "-o", str(target), str(source)],
+                check=True,
+                capture_output=True,
+            )
+            # rename so concurrent builds never load a half-written library
+            target.replace(path)
+    lib = ctypes.CDLL(str(path))
+    lib.intcode_run.restype = ctypes.c_int
+    lib.intcode_run.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_int64,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_int64,
+        ctypes.c_void_p,
+        ctypes.c_int64,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_int64,
+    ]
+    return lib
+
+
+def library() -> Optional[ctypes.CDLL]:
+    """The compiled kernel, or None if it cannot be built here."""
+    global _library, _build_failed
+    if _library is None and not _build_failed:
+        try:
+            _library = _build()
+        except (OSError, subprocess.CalledProcessError):
+            _build_failed = True
+    return _library
+
+
+_ALLOWED: Dict[str, int] = {
+    name: sum(1 << op.code for op in ops if op != OP.HALT)
+    for name, ops in PROFILES.items()
+}
+
+
+class NativeImage:
+    """The int64 copy of a VM's memory that the kernel runs on."""
+
+    __slots__ = ("cells", "dirty", "pages", "outbuf", "dense", "writes")
+
+    def __init__(self, mem: Memory, cells: array) -> None:
+        self.cells = cells
+        # one flag per page of cells, set for the pages the kernel wrote
+        # since the last _store, and the list of those pages
+        n_pages = (len(cells) >> PAGE_BITS) + 1
+        self.dirty = array("B", bytes(n_pages))
+        self.pages = array("q", bytes(8 * n_pages))
+        self.outbuf = array("q", bytes(8 * OUT_CHUNK))
+        # mem's storage and write count when cells last matched it
+        self.dense = mem.dense
+        self.writes = mem.writes
+
+    def current(self, mem: Memory) -> bool:
+        return self.dense is mem.dense and self.writes == mem.writes
+
+
+def _load(mem: Memory) -> Optional[NativeImage]:
+    # int64 image of mem, or None if some cell cannot be represented
+    sparse = mem.sparse
+    if any(addr < 0 for addr in sparse):
+        return None
+    size = max(len(mem.dense), max(sparse, default=-1) + 1)
+    if size > MAX_CELLS:
+        return None
+    try:
+        cells = array("q", mem.dense)
+        cells.extend(array("q", [0]) * (size - len(cells)))
+        for addr, val in sparse.items():
+            cells[addr] = val
+    except OverflowError:
+        return None
+    return NativeImage(mem, cells)
+
+
+def _store(mem: Memory, image: NativeImage, state: array) -> None:
+    # copy the pages the kernel wrote back into mem
+    n_pages = state[6]
+    if not n_pages:
+        return
+    state[6] = 0
+    cells, dirty, dense = image.cells, image.dirty, mem.dense
+    writes = mem.writes
+    for page in image.pages[:n_pages]:
+        dirty[page] = 0
+        lo = page << PAGE_BITS
+        hi = lo + (1 << PAGE_BITS)
+        if hi <= len(dense):
+            dense[lo:hi] = cells[lo:hi]
+            continue
+        hi = min(hi, len(cells))
+        split = max(lo, len(dense))
+        if lo < split:
+            dense[lo:split] = cells[lo:split]
+        for addr in range(split, hi):
+            val = cells[addr]
+            if val or addr in mem.sparse:
+                mem[addr] = val
+    # those writes came from the kernel, so cells still matches them
+    image.writes += mem.writes - writes
+
+
+def _sync(vm: "IntcodeVM", image: NativeImage, state: array) -> None:
+    # callbacks may inspect the VM, so bring it up to date before each
+    vm.ip, vm.rel_base = state[0], state[1]
+    _store(vm.mem, image, state)
+
+
+def run_native(
+    vm: "IntcodeVM",
+    in_f: Optional[Callable[[], int]],
+    out: Callable[[int], None],
+    max_steps: Optional[int],
+    max_outputs: Optional[int],
+) -> None:
+    lib = library()
+    mem = vm.mem
+    image = vm._image
+    if lib is not None and (image is None or not image.current(mem)):
+        image = vm._image = _load(mem)
+    if lib is None or image is None:
+        # the interpreter writes to memory without counting, so drop the image
+        vm._image = None
+        vm._run_interp(in_f, out, max_steps, max_outputs)
+        return
+
+    inputs = vm.inputs
+    # anything but the VM's own queue may write to memory on each output
+    chunk = OUT_CHUNK if out == vm.outputs.append else 1
+    steps = -1 if max_steps is None else max_steps
+    state = array("q", [vm.ip, vm.rel_base, steps, 0, 0, 0, 0])
+    outputs_left = -1 if max_outputs is None else max_outputs
+    allowed = _ALLOWED[vm.profile]
+    status = OUT_OF_STEPS
+    try:
+        while state[2] != 0 and outputs_left != 0:
+            try:
+                feed = array("q", inputs)
+            except OverflowError:
+                status = FALLBACK
+                break
+            cells, dirty, pages = image.cells, image.dirty, image.pages
+            outbuf = image.outbuf
+            cap = chunk if outputs_left < 0 else min(chunk, outputs_left)
+            status = lib.intcode_run(
+                cells.buffer_info()[0],
+                len(cells),
+                state.buffer_info()[0],
+                feed.buffer_info()[0],
+                len(feed),
+                outbuf.buffer_info()[0],
+                cap,
+                dirty.buffer_info()[0],
+                pages.buffer_info()[0],
+                allowed,
+            )
+            for _ in range(state[3]):
+                inputs.popleft()
+            n_out = state[4]
+            if n_out:
+                if outputs_left > 0:
+                    outputs_left -= n_out
+                _sync(vm, image, state)
+                for val in outbuf[:n_out]:
+                    out(val)
+
+            if status == HALTED:
+                vm.halted = True
+                break
+            elif status == NEED_INPUT:
+                if in_f is None:
+                    break
+                _sync(vm, image, state)
+                inputs.append(in_f())
+            elif status == GROW:
+                need = state[5] + 1
+                if need > MAX_CELLS:
+                    status = FALLBACK
+                    break
+                size = max(need, 2 * len(cells))
+                cells.extend(array("q", [0]) * (size - len(cells)))
+                grown = (size >> PAGE_BITS) + 1 - len(dirty)
+                dirty.extend(bytes(grown))
+                pages.extend(bytes(8 * grown))
+            elif status == FALLBACK:
+                break
+            if mem.writes != image.writes:
+                # in_f or out wrote to memory, maybe to code the kernel runs
+                image = vm._image = _load(mem)
+                if image is None:
+                    status = FALLBACK
+                    break
+    finally:
+        vm.ip, vm.rel_base = state[0], state[1]
+        if image is not None:
+            _store(mem, image, state)
+
+    if status == FALLBACK:
+        vm._image = None
+        steps_left = state[2]
+        vm._run_interp(
+            in_f,
+            out,
+            None if steps_left < 0 else steps_left,
+            None if outputs_left < 0 else outputs_left,
+        )
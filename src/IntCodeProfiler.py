@@ -0,0 +1,350 @@
+"""Instruction-level profiling for Intcode programs.
+
+ProfiledVM is an IntcodeVM whose run loop records what the program does:
+per-opcode and per-address execution counts, taken jumps, memory reads and
+writes by address, and time spent in I/O. The ordinary engines are untouched,
+so profiling costs nothing unless a ProfiledVM is used.
+
+Intcode has no call instruction, but compiled programs enter a function by
+moving the relative base up and leave by moving it back down. The profiler
+treats each positive rel-base adjustment as a call to a function named after
+its address, which is enough for flame graphs in speedscope or a pstats view.
+
+Run from src/ to profile a program file:
+
+    python -m IntCodeProfiler y19d9p2/input.txt --input 2 --dump boost.json
+"""
+
+import argparse
+import json
+import marshal
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from IntCode import OP, IntcodeVM, Memory
+from IntCodeLoader import load_memory
+
+Stack = Tuple[int, ...]
+
+
+class Profile:
+    """Counters collected by a ProfiledVM; all times are in seconds."""
+
+    def __init__(self) -> None:
+        self.op_counts: Counter[OP] = Counter()
+        self.addr_counts: Counter[int] = Counter()
+        # (jump address, target) -> times taken
+        self.jumps: Counter[Tuple[int, int]] = Counter()
+        self.reads: Counter[int] = Counter()
+        self.writes: Counter[int] = Counter()
+        # (call stack, address) -> instructions executed there
+        self.samples: Counter[Tuple[Stack, int]] = Counter()
+        self.calls: Counter[Tuple[Stack, int]] = Counter()
+        self.elapsed = 0.0
+        # time in the in_f/out_f callbacks, and paused waiting for send()
+        self.io_time = 0.0
+        self.input_wait = 0.0
+
+    @property
+    def steps(self) -> int:
+        return sum(self.op_counts.values())
+
+    def report(self, top: int = 10) -> str:
+        steps = self.steps
+        rate = steps / self.elapsed if self.elapsed else 0.0
+        lines = [
+            f"{steps:,} instructions in {self.elapsed:.3f}s ({rate:,.0f} ips)",
+            f"I/O callbacks {self.io_time:.3f}s, "
+            f"waiting for input {self.input_wait:.3f}s",
+            "",
+            "opcodes:",
+        ]
+        for op, count in self.op_counts.most_common():
+            lines.append(f"  {op.name:<16}{count:>12,}  {count / steps:6.1%}")
+
+        def section(title: str, counts: Counter, fmt: Callable[[object], str]) -> None:
+            lines.append("")
+            lines.append(f"{title}:")
+            for key, count in counts.most_common(top):
+                lines.append(f"  {fmt(key):<16}{count:>12,}")
+
+        section("hot addresses", self.addr_counts, lambda a: f"ip {a}")
+        section("taken jumps", self.jumps, lambda j: f"{j[0]} -> {j[1]}")
+        section("memory reads", self.reads, lambda a: f"[{a}]")
+        section("memory writes", self.writes, lambda a: f"[{a}]")
+        return "\n".join(lines)
+
+    def speedscope(self, name: str = "intcode") -> Dict[str, object]:
+        """Sampled speedscope profile weighted by instructions executed."""
+        frames: List[Dict[str, str]] = []
+        index: Dict[str, int] = {}
+
+        def frame(label: str) -> int:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            return index[label]
+
+        samples: List[List[int]] = []
+        weights: List[int] = []
+        for (stack, addr), count in self.samples.items():
+            path = [frame(f"fn@{entry}") for entry in stack]
+            path.append(frame(f"ip {addr}"))
+            samples.append(path)
+            weights.append(count)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "none",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "IntCodeProfiler",
+        }
+
+    def pstats(self) -> Dict[Tuple[str, int, str], tuple]:
+        """Function-level stats in the marshal format pstats.Stats loads.
+
+        Times are estimated by spreading the elapsed time evenly over the
+        instructions executed.
+        """
+        per_step = self.elapsed / self.steps if self.steps else 0.0
+
+        def key(stack: Stack) -> Tuple[str, int, str]:
+            if not stack:
+                return ("intcode", 0, "<program>")
+            return ("intcode", stack[-1], f"fn@{stack[-1]}")
+
+        own: Counter[Stack] = Counter()
+        for (stack, _), count in self.samples.items():
+            own[stack] += count
+        # instructions executed in each stack or anything it called
+        inclusive: Counter[Stack] = Counter()
+        for stack, count in own.items():
+            for depth in range(len(stack) + 1):
+                inclusive[stack[:depth]] += count
+        # like cProfile, a recursive function only counts its outermost call
+        cumulative: Counter[Tuple[str, int, str]] = Counter()
+        for stack, count in own.items():
+            for k in {key(stack[:depth]) for depth in range(len(stack) + 1)}:
+                cumulative[k] += count
+
+        stats: Dict[Tuple[str, int, str], list] = {}
+        for stack in inclusive:
+            calls = self.calls[stack[:-1], stack[-1]] if stack else 1
+            entry = stats.setdefault(key(stack), [0, 0, 0.0, 0.0, {}])
+            entry[0] += calls
+            entry[1] += calls
+            entry[2] += own[stack] * per_step
+            entry[3] = cumulative[key(stack)] * per_step
+            if stack:
+                own_time = own[stack] * per_step
+                edge = (calls, calls, own_time, inclusive[stack] * per_step)
+                callers = entry[4]
+                prev = callers.get(key(stack[:-1]), (0, 0, 0.0, 0.0))
+                callers[key(stack[:-1])] = tuple(p + e for p, e in zip(prev, edge))
+        return {k: tuple(v) for k, v in stats.items()}
+
+    def dump(self, path: str) -> None:
+        """Write a speedscope .json, a pstats .prof/.pstats, or a text report."""
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.speedscope(), f)
+        elif path.endswith((".prof", ".pstats")):
+            with open(path, "wb") as f:
+                marshal.dump(self.pstats(), f)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.report() + "\n")
+
+
+class ProfiledVM(IntcodeVM):
+    """An IntcodeVM that fills self.stats as it runs.
+
+    Always interprets, whatever engine is asked for. When dump is set the
+    profile is written there once the program halts. fork() gives a plain,
+    unprofiled IntcodeVM.
+    """
+
+    def __init__(
+        self,
+        mem: Memory | dict[int, int] | list[int],
+        profile: str = "day9",
+        dump: Optional[str] = None,
+    ) -> None:
+        super().__init__(mem, "interp", profile)
+        self.stats = Profile()
+        self.dump = dump
+        self._stack: Stack = ()
+        self._paused_at: Optional[float] = None
+
+    def run(
+        self,
+        in_f: Optional[Callable[[], int]] = None,
+        out_f: Optional[Callable[[int], None]] = None,
+        max_steps: Optional[int] = None,
+        max_outputs: Optional[int] = None,
+    ) -> None:
+        if self.halted:
+            return
+        stats = self.stats
+        if self._paused_at is not None:
+            stats.input_wait += time.perf_counter() - self._paused_at
+            self._paused_at = None
+        self.mem.own()
+        out = self.outputs.append if out_f is None else out_f
+        start = time.perf_counter()
+        try:
+            self._run_profiled(in_f, out, max_steps, max_outputs)
+        finally:
+            stats.elapsed += time.perf_counter() - start
+        if self.halted:
+            if self.dump is not None:
+                stats.dump(self.dump)
+        elif self.waiting:
+            self._paused_at = time.perf_counter()
+
+    def _run_profiled(
+        self,
+        in_f: Optional[Callable[[], int]],
+        out: Callable[[int], None],
+        max_steps: Optional[int],
+        max_outputs: Optional[int],
+    ) -> None:
+        stats = self.stats
+        op_counts, addr_counts = stats.op_counts, stats.addr_counts
+        jumps, reads, writes = stats.jumps, stats.reads, stats.writes
+        samples, calls = stats.samples, stats.calls
+        clock = time.perf_counter
+        mem = self.mem
+        get = mem.get
+        inputs = self.inputs
+        decode = self._decoder
+        ip = self.ip
+        rel_base = self.rel_base
+        stack = self._stack
+        steps_left = -1 if max_steps is None else max_steps
+        outputs_left = -1 if max_outputs is None else max_outputs
+
+        def load(mode: int, val: int) -> int:
+            if mode == 1:
+                return val
+            if mode == 0:
+                addr = val
+            elif mode == 2:
+                addr = rel_base + val
+            else:
+                raise RuntimeError(f"Invalid parameter mode: {mode}")
+            reads[addr] += 1
+            return get(addr)
+
+        def store(mode: int, val: int, x: int) -> None:
+            addr = rel_base + val if mode == 2 else val
+            writes[addr] += 1
+            mem[addr] = x
+
+        try:
+            while steps_left != 0:
+                at = ip
+                try:
+                    op, modes = decode(get(ip))
+                except ValueError as e:
+                    raise RuntimeError(f"{e} at ip={at}") from None
+                if op == OP.IN and not inputs and in_f is None:
+                    return
+                steps_left -= 1
+                op_counts[op] += 1
+                addr_counts[at] += 1
+                samples[stack, at] += 1
+                args = [get(a) for a in range(ip + 1, ip + 1 + op.args)]
+                ip += 1 + op.args
+
+                if op == OP.ADD:
+                    a, b = load(modes[0], args[0]), load(modes[1], args[1])
+                    store(modes[2], args[2], a + b)
+
+                elif op == OP.MULT:
+                    a, b = load(modes[0], args[0]), load(modes[1], args[1])
+                    store(modes[2], args[2], a * b)
+
+                elif op == OP.LESS_THAN:
+                    a, b = load(modes[0], args[0]), load(modes[1], args[1])
+                    store(modes[2], args[2], 1 if a < b else 0)
+
+                elif op == OP.EQUALS:
+                    a, b = load(modes[0], args[0]), load(modes[1], args[1])
+                    store(modes[2], args[2], 1 if a == b else 0)
+
+                elif op == OP.JUMP_TRUE or op == OP.JUMP_FALSE:
+                    val = load(modes[0], args[0])
+                    if (val != 0) == (op == OP.JUMP_TRUE):
+                        ip = load(modes[1], args[1])
+                        jumps[at, ip] += 1
+
+                elif op == OP.IN:
+                    if inputs:
+                        val = inputs.popleft()
+                    else:
+                        start = clock()
+                        val = in_f()
+                        stats.io_time += clock() - start
+                    store(modes[0], args[0], val)
+
+                elif op == OP.OUT:
+                    val = load(modes[0], args[0])
+                    start = clock()
+                    out(val)
+                    stats.io_time += clock() - start
+                    outputs_left -= 1
+                    if outputs_left == 0:
+                        return
+
+                elif op == OP.UDATE_REL_BASE:
+                    delta = load(modes[0], args[0])
+                    rel_base += delta
+                    if delta > 0:
+                        calls[stack, at] += 1
+                        stack = stack + (at,)
+                    elif delta < 0 and stack:
+                        stack = stack[:-1]
+
+                else:  # OP.HALT
+                    ip = at
+                    self.halted = True
+                    return
+        finally:
+            self.ip = ip
+            self.rel_base = rel_base
+            self._stack = stack
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile an Intcode program.")
+    parser.add_argument("program", help="file with the comma-separated program")
+    parser.add_argument("--input", type=int, action="append", default=[],
+                        help="value to queue as input; repeat for more")
+    parser.add_argument("--profile", default="day9", help="opcode set to allow")
+    parser.add_argument("--dump", help="write .json (speedscope), .prof (pstats) or text")
+    parser.add_argument("--top", type=int, default=10, help="rows per table")
+    args = parser.parse_args()
+
+    vm = ProfiledVM(load_memory(args.program), args.profile, args.dump)
+    vm.send(*args.input)
+    vm.run()
+    state = "halted" if vm.halted else "waiting for input"
+    print(f"{state} after {len(vm.outputs)} outputs: {list(vm.outputs)[-10:]}")
+    print(vm.stats.report(args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+import asyncio
+from enum import Enum
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from IntCode import IntcodeVM
+
+# (destination node, values) deliveries for one chunk of a node's outputs
+Router = Callable[[List[int]], Iterable[Tuple[int, List[int]]]]
+
+
+class Deadlock(RuntimeError):
+    pass
+
+
+class NodeState(Enum):
+    RUNNING = 0
+    BLOCKED_IN = 1
+    BLOCKED_OUT = 2
+    HALTED = 3
+
+
+class _Node:
+    def __init__(self, vm: IntcodeVM, queue_size: int, idle_input: Optional[int]):
+        self.vm = vm
+        self.inbox: asyncio.Queue[int] = asyncio.Queue(queue_size)
+        self.idle_input = idle_input
+        self.router: Optional[Router] = None
+        self.chunk = 1
+        self.state = NodeState.RUNNING
+        self.blocked_on: Optional[asyncio.Queue[int]] = None
+        # asked for input and found nothing since it last got or sent a value
+        self.idle = False
+
+
+class IntcodeScheduler:
+    """Runs many IntcodeVMs cooperatively on one asyncio event loop.
+
+    Each node runs for slice_steps instructions at a time and only yields to
+    the loop between slices, when it blocks on an empty inbox, or when it
+    blocks delivering to a full one, so switching cost is paid per slice
+    rather than per instruction. Outputs are handed to the node's router in
+    chunks; connect() sets up plain point-to-point links. Every inbox holds at
+    most queue_size values: a node delivering to a full one blocks until the
+    receiver takes a value, and send() raises asyncio.QueueFull instead.
+
+    Nodes with an idle_input get that value instead of blocking when their
+    inbox is empty (the NIC convention of reading -1). The network is idle
+    when every running node is waiting on an empty inbox and no values are in
+    flight; run() then calls on_idle, which can queue more input and return
+    True to keep going. If every node is blocked and at least one is stuck on
+    a full inbox, run() raises Deadlock.
+    """
+
+    def __init__(self, slice_steps: int = 10_000, queue_size: int = 1024) -> None:
+        if queue_size < 1:
+            # asyncio.Queue treats 0 as unbounded, which would hide deadlocks
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        self.slice_steps = slice_steps
+        self.queue_size = queue_size
+        self.nodes: List[_Node] = []
+        self._done: Optional[asyncio.Future[None]] = None
+        self._on_idle: Optional[Callable[[], bool]] = None
+        # kept up to date so _check_blocked can usually answer without
+        # looking at every node: nodes not halted, nodes that are RUNNING,
+        # BLOCKED_OUT or not idle, and values sitting in inboxes
+        self._live = 0
+        self._running = 0
+        self._blocked_out = 0
+        self._busy = 0
+        self._queued = 0
+
+    def add(self, vm: IntcodeVM, idle_input: Optional[int] = None) -> int:
+        self.nodes.append(_Node(vm, self.queue_size, idle_input))
+        self._live += 1
+        self._running += 1
+        self._busy += 1
+        return len(self.nodes) - 1
+
+    def route(self, src: int, router: Router, chunk: int = 1) -> None:
+        self.nodes[src].router = router
+        self.nodes[src].chunk = chunk
+
+    def connect(self, src: int, dst: int) -> None:
+        self.route(src, lambda values: [(dst, values)])
+
+    def send(self, node: int, *values: int) -> None:
+        inbox = self.nodes[node].inbox
+        for val in values:
+            inbox.put_nowait(val)
+            self._queued += 1
+
+    def run(self, on_idle: Optional[Callable[[], bool]] = None) -> None:
+        asyncio.run(self.run_async(on_idle))
+
+    async def run_async(self, on_idle: Optional[Callable[[], bool]] = None) -> None:
+        self._on_idle = on_idle
+        self._done = asyncio.get_running_loop().create_future()
+        tasks = [asyncio.create_task(self._drive(node)) for node in self.nodes]
+        try:
+            await self._done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _drive(self, node: _Node) -> None:
+        vm = node.vm
+        inbox = node.inbox
+        try:
+            while not vm.halted:
+                while not inbox.empty():
+                    vm.send(inbox.get_nowait())
+                    self._queued -= 1
+                    self._set_idle(node, False)
+
+                vm.run(max_steps=self.slice_steps)
+                await self._deliver(node)
+
+                if vm.waiting:
+                    if not inbox.empty():
+                        continue
+                    self._set_idle(node, True)
+                    if node.idle_input is not None:
+                        vm.send(node.idle_input)
+                        self._check_blocked()
+                    else:
+                        self._set_state(node, NodeState.BLOCKED_IN)
+                        self._check_blocked()
+                        val = await inbox.get()
+                        self._queued -= 1
+                        self._set_state(node, NodeState.RUNNING)
+                        self._set_idle(node, False)
+                        vm.send(val)
+                await asyncio.sleep(0)
+
+            self._set_state(node, NodeState.HALTED)
+            self._check_blocked()
+        except Exception as e:
+            if self._done is not None and not self._done.done():
+                self._done.set_exception(e)
+            raise
+
+    async def _deliver(self, node: _Node) -> None:
+        router = node.router
+        outputs = node.vm.outputs
+        if router is None:
+            return
+        while len(outputs) >= node.chunk:
+            chunk = [outputs.popleft() for _ in range(node.chunk)]
+            self._set_idle(node, False)
+            for dst, values in router(chunk):
+                inbox = self.nodes[dst].inbox
+                for val in values:
+                    if inbox.full():
+                        self._set_state(node, NodeState.BLOCKED_OUT)
+                        node.blocked_on = inbox
+                        self._check_blocked()
+                        await inbox.put(val)
+                        self._set_state(node, NodeState.RUNNING)
+                        node.blocked_on = None
+                    else:
+                        inbox.put_nowait(val)
+                    self._queued += 1
+
+    def _set_state(self, node: _Node, state: NodeState) -> None:
+        for old, step in ((node.state, -1), (state, 1)):
+            if old == NodeState.RUNNING:
+                self._running += step
+            elif old == NodeState.BLOCKED_OUT:
+                self._blocked_out += step
+        if state == NodeState.HALTED:
+            self._live -= 1
+            self._set_idle(node, True)
+        node.state = state
+
+    def _set_idle(self, node: _Node, idle: bool) -> None:
+        if node.idle != idle:
+            node.idle = idle
+            self._busy += -1 if idle else 1
+
+    def _check_blocked(self) -> None:
+        done = self._done
+        if done is None or done.done():
+            return
+        if not self._live:
+            done.set_result(None)
+            return
+        # some node is busy or a value is in flight, so the network is not
+        # idle, and either a node can still run or none waits on a full inbox
+        if (self._busy or self._queued) and (self._running or not self._blocked_out):
+            return
+
+        live = [node for node in self.nodes if node.state != NodeState.HALTED]
+
+        in_flight = any(not node.inbox.empty() for node in self.nodes)
+        if all(node.idle for node in live) and not in_flight:
+            if self._on_idle is not None and self._on_idle():
+                return
+            done.set_result(None)
+        elif all(self._stuck(node) for node in live) and any(
+            node.state == NodeState.BLOCKED_OUT for node in live
+        ):
+            done.set_exception(Deadlock("Every Intcode node is blocked"))
+
+    @staticmethod
+    def _stuck(node: _Node) -> bool:
+        # a blocked node whose queue has already changed is about to wake up
+        if node.state == NodeState.BLOCKED_IN:
+            return node.inbox.empty()
+        if node.state == NodeState.BLOCKED_OUT:
+            return node.blocked_on is not None and node.blocked_on.full()
+        return False
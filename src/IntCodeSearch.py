@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from multiprocessing.synchronize import Event
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from IntCode import IntcodeVM, Memory
+
+# per-worker search state, set once by _init_worker so the program image is
+# shipped to each process once rather than with every chunk
+_image: Sequence[int] = ()
+_addrs: Sequence[int] = ()
+_out_addr = 0
+_target = 0
+_engine = "interp"
+_profile = "day9"
+_stop: Optional[Event] = None
+
+
+def _init_worker(
+    image: Sequence[int],
+    addrs: Sequence[int],
+    out_addr: int,
+    target: int,
+    engine: str,
+    profile: str,
+    stop: Optional[Event],
+) -> None:
+    global _image, _addrs, _out_addr, _target, _engine, _profile, _stop
+    _image, _addrs, _out_addr, _target, _engine, _profile, _stop = (
+        image,
+        addrs,
+        out_addr,
+        target,
+        engine,
+        profile,
+        stop,
+    )
+
+
+def _matches(inputs: Tuple[int, ...]) -> bool:
+    mem = Memory(_image)
+    for addr, val in zip(_addrs, inputs):
+        mem[addr] = val
+    vm = IntcodeVM(mem, _engine, _profile)
+    try:
+        vm.run()
+    except RuntimeError:
+        # e.g. an invalid mode or opcode reached with these inputs
+        return False
+    return vm.halted and mem[_out_addr] == _target
+
+
+def _search_chunk(chunk: List[Tuple[int, ...]]) -> Optional[Tuple[int, ...]]:
+    for inputs in chunk:
+        if _stop is not None and _stop.is_set():
+            return None
+        if _matches(inputs):
+            return inputs
+    return None
+
+
+def _chunks(
+    candidates: Iterable[Tuple[int, ...]], size: int
+) -> Iterator[List[Tuple[int, ...]]]:
+    it = iter(candidates)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def find_inputs(
+    image: Sequence[int],
+    target: int,
+    candidates: Iterable[Tuple[int, ...]],
+    addrs: Sequence[int] = (1, 2),
+    out_addr: int = 0,
+    engine: str = "interp",
+    profile: str = "day9",
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+) -> Optional[Tuple[int, ...]]:
+    """Find inputs that make mem[out_addr] equal target once the program halts.
+
+    Each candidate is a tuple of values written to addrs before the run. The
+    candidates are split into chunks and searched by a pool of worker
+    processes; as soon as one worker reports a match the others stop at their
+    next candidate and queued chunks are cancelled. With several workers the
+    match returned is the first one found, not necessarily the first in
+    candidate order. Programs that ask for input never match.
+    """
+    image = list(image)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(image, addrs, out_addr, target, engine, profile, None)
+        return next(
+            (
+                match
+                for chunk in _chunks(candidates, chunk_size)
+                if (match := _search_chunk(chunk)) is not None
+            ),
+            None,
+        )
+
+    stop = multiprocessing.Event()
+    chunks = _chunks(candidates, chunk_size)
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(image, addrs, out_addr, target, engine, profile, stop),
+    ) as pool:
+        pending: Set[Future[Optional[Tuple[int, ...]]]] = set()
+        try:
+            while True:
+                # keep a couple of chunks queued per worker, not the whole sweep
+                for chunk in islice(chunks, 2 * workers - len(pending)):
+                    pending.add(pool.submit(_search_chunk, chunk))
+                if not pending:
+                    return None
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    match = future.result()
+                    if match is not None:
+                        return match
+        finally:
+            stop.set()
+            for future in pending:
+                future.cancel()
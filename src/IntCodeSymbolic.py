@@ -0,0 +1,166 @@
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from IntCode import OP, _decode
+from IntCodeSearch import find_inputs
+
+
+class NotArithmetic(Exception):
+    """The program does something other than add/multiply fixed addresses."""
+
+
+class Poly:
+    """Polynomial with integer coefficients over a fixed number of variables.
+
+    Terms map exponent tuples to coefficients, e.g. {(1, 0): 100, (0, 1): 1,
+    (0, 0): 7} is 100*x0 + x1 + 7.
+    """
+
+    def __init__(self, terms: Dict[Tuple[int, ...], int]) -> None:
+        self.terms = {exps: c for exps, c in terms.items() if c != 0}
+
+    @classmethod
+    def const(cls, val: int, nvars: int) -> "Poly":
+        return cls({(0,) * nvars: val})
+
+    @classmethod
+    def var(cls, i: int, nvars: int) -> "Poly":
+        return cls({tuple(1 if j == i else 0 for j in range(nvars)): 1})
+
+    def constant(self) -> Optional[int]:
+        if not self.terms:
+            return 0
+        if len(self.terms) == 1:
+            ((exps, c),) = self.terms.items()
+            if not any(exps):
+                return c
+        return None
+
+    def __add__(self, other: "Poly") -> "Poly":
+        terms = dict(self.terms)
+        for exps, c in other.terms.items():
+            terms[exps] = terms.get(exps, 0) + c
+        return Poly(terms)
+
+    def __mul__(self, other: "Poly") -> "Poly":
+        terms: Dict[Tuple[int, ...], int] = {}
+        for e1, c1 in self.terms.items():
+            for e2, c2 in other.terms.items():
+                exps = tuple(a + b for a, b in zip(e1, e2))
+                terms[exps] = terms.get(exps, 0) + c1 * c2
+        return Poly(terms)
+
+    def coefficients(self, values: Sequence[int]) -> List[int]:
+        # substitute values for all but the last variable; returns the
+        # coefficients of the remaining univariate polynomial, lowest first
+        coeffs: List[int] = []
+        for exps, c in self.terms.items():
+            k = exps[-1]
+            coeffs.extend([0] * (k + 1 - len(coeffs)))
+            for val, e in zip(values, exps):
+                c *= val**e
+            coeffs[k] += c
+        return coeffs
+
+    def __repr__(self) -> str:
+        return f"Poly({self.terms!r})"
+
+
+def run_symbolic(
+    image: Sequence[int], addrs: Sequence[int], out_addr: int = 0
+) -> Poly:
+    """Run an add/multiply-only program with variables in place of mem[addrs].
+
+    A read through an address that depends on the variables gives an unknown
+    value (None); that is fine as long as it is overwritten before it is
+    needed, as with day 2's first instruction. Raises NotArithmetic if the
+    program uses any other opcode or relative mode, writes through an unknown
+    address, or needs an unknown value as an opcode, address or the result.
+    """
+    nvars = len(addrs)
+    mem: List[Optional[Poly]] = [Poly.const(val, nvars) for val in image]
+    for i, addr in enumerate(addrs):
+        mem[addr] = Poly.var(i, nvars)
+
+    def concrete(addr: int) -> Optional[int]:
+        val = mem[addr] if 0 <= addr < len(mem) else None
+        return None if val is None else val.constant()
+
+    def address(addr: int) -> Optional[int]:
+        target = concrete(addr)
+        return target if target is not None and 0 <= target < len(mem) else None
+
+    ip = 0
+    while True:
+        word = concrete(ip)
+        if word == 99:
+            result = mem[out_addr]
+            if result is None:
+                raise NotArithmetic(f"Result at {out_addr} is not known")
+            return result
+        if word is None:
+            raise NotArithmetic(f"Opcode at ip={ip} is not a known constant")
+        op, modes = _decode(word)
+        if op not in (OP.ADD, OP.MULT) or modes[2] != 0:
+            raise NotArithmetic(f"Unsupported instruction {word} at ip={ip}")
+
+        args: List[Optional[Poly]] = []
+        for i in range(2):
+            if modes[i] == 0:
+                src = address(ip + 1 + i)
+                args.append(None if src is None else mem[src])
+            elif modes[i] == 1:
+                args.append(mem[ip + 1 + i])
+            else:
+                raise NotArithmetic(f"Unsupported parameter mode at ip={ip}")
+        out = address(ip + 3)
+        if out is None:
+            raise NotArithmetic(f"Write address at ip={ip} is not known")
+        a, b = args
+        if a is None or b is None:
+            mem[out] = None
+        else:
+            mem[out] = a + b if op == OP.ADD else a * b
+        ip += 4
+
+
+def solve_inputs(
+    image: Sequence[int],
+    target: int,
+    ranges: Sequence[range],
+    addrs: Sequence[int] = (1, 2),
+    out_addr: int = 0,
+    profile: str = "day9",
+) -> Optional[Tuple[int, ...]]:
+    """Find inputs in ranges that make mem[out_addr] equal target.
+
+    For add/multiply-only programs mem[out_addr] is computed once as a
+    polynomial in the inputs. Every combination of all but the last input
+    is then substituted, and the last input is solved for directly when the
+    result is linear in it or checked by evaluation otherwise. Returns the
+    first match in the order find_inputs would try them. Other programs
+    fall back to find_inputs.
+    """
+    try:
+        poly = run_symbolic(image, addrs, out_addr)
+    except NotArithmetic:
+        return find_inputs(
+            image, target, product(*ranges), addrs, out_addr, profile=profile
+        )
+
+    last = ranges[-1]
+    for values in product(*ranges[:-1]):
+        coeffs = poly.coefficients(values)
+        if len(coeffs) <= 2:
+            c0 = coeffs[0] if coeffs else 0
+            c1 = coeffs[1] if len(coeffs) > 1 else 0
+            if c1 == 0:
+                if c0 == target and len(last) > 0:
+                    return (*values, last[0])
+            elif (target - c0) % c1 == 0 and (target - c0) // c1 in last:
+                return (*values, (target - c0) // c1)
+        else:
+            for x in last:
+                if sum(c * x**k for k, c in enumerate(coeffs)) == target:
+                    return (*values, x)
+    return None
@@ -0,0 +1,243 @@
+"""The two location-ID columns of 2024 day 1 and how they compare.
+
+read_columns() parses a whole file in one go into two int64 arrays, and
+total_distance() pairs the columns in sorted order in a single pass: with
+NumPy the sorts and the sum are array operations, without it sorted() and
+one zip. external_distance() gives the same answer for files too big to
+hold: sorted_columns() feeds the rows through two ExternalSorters, which
+spill sorted runs to disk and merge them back with heapq.merge, and the
+distance is summed from the merged streams.
+
+similarity() is d2_2's score: every distinct left value times how often it
+appears on the right. With NumPy it counts the right column with np.unique
+and looks the left values up with searchsorted; external_similarity()
+streams the externally sorted columns through merge_similarity() instead.
+streaming_similarity() holds only the distinct left values and counts the
+right column against them as it streams past, and sketch_similarity()
+bounds memory further with a Count-Min sketch, at the price of an estimate.
+"""
+
+import itertools
+import operator
+import os
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator, Tuple
+
+from CountMinSketch import CountMinSketch
+from ExternalSort import ExternalSorter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Columns = Tuple[array, array]
+
+
+def _parse_lines(lines: Iterable[str]) -> Columns:
+    # lines with fewer than two numbers are skipped; extra ones are ignored
+    left, right = array("q"), array("q")
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        try:
+            a, b = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        left.append(a)
+        right.append(b)
+    return left, right
+
+
+def parse_columns(text: str) -> Columns:
+    if not text.endswith("\n"):
+        text += "\n"
+    lines = text.count("\n")
+    # with a marker token at the end of every line, every third token is a
+    # marker exactly when each line holds two numbers: convert them all at once
+    tokens = text.replace("\n", " ; ").split()
+    if len(tokens) == 3 * lines and tokens[2::3].count(";") == lines:
+        try:
+            left = array("q", map(int, tokens[0::3]))
+            right = array("q", map(int, tokens[1::3]))
+        except ValueError:
+            pass
+        else:
+            return left, right
+    return _parse_lines(text.split("\n"))
+
+
+def read_columns(path: str | os.PathLike) -> Columns:
+    with open(path, "r") as f:
+        return parse_columns(f.read())
+
+
+def read_chunks(path: str | os.PathLike, rows: int = 1_000_000) -> Iterator[Columns]:
+    """The columns of path, rows lines at a time."""
+    with open(path, "r") as src:
+        while lines := list(itertools.islice(src, rows)):
+            yield parse_columns("".join(lines))
+
+
+def total_distance(left: array, right: array) -> int:
+    """Sum of |l - r| over the columns paired smallest with smallest."""
+    if np is not None:
+        lo = np.sort(np.frombuffer(left, dtype=np.int64))
+        hi = np.sort(np.frombuffer(right, dtype=np.int64))
+        n = min(len(lo), len(hi))
+        return int(np.abs(lo[:n] - hi[:n]).sum())
+    return sum(abs(a - b) for a, b in zip(sorted(left), sorted(right)))
+
+
+def _distinct(values: "np.ndarray") -> "np.ndarray":
+    # the distinct values of a sorted array; np.unique(values) alone takes a
+    # much slower path than sorting
+    return values[np.append(True, values[1:] != values[:-1])] if len(values) else values
+
+
+def similarity(left: array, right: array) -> int:
+    """Sum of v * (times v is in right) over the distinct values v of left."""
+    if np is not None:
+        keys = _distinct(np.sort(np.frombuffer(left, dtype=np.int64)))
+        values, counts = np.unique(
+            np.frombuffer(right, dtype=np.int64), return_counts=True
+        )
+        if not len(values):
+            return 0
+        at = np.searchsorted(values, keys).clip(max=len(values) - 1)
+        found = values[at] == keys
+        return int((keys[found] * counts[at[found]]).sum())
+    counts = Counter(right)
+    return sum(value * counts[value] for value in set(left))
+
+
+def sorted_columns(
+    path: str | os.PathLike, run_size: int = 1_000_000
+) -> Tuple[ExternalSorter, ExternalSorter]:
+    """Both columns of path in ExternalSorters, reading run_size rows at a
+    time; the caller closes them."""
+    left, right = ExternalSorter(run_size), ExternalSorter(run_size)
+    for chunk_left, chunk_right in read_chunks(path, run_size):
+        left.extend(chunk_left)
+        right.extend(chunk_right)
+    return left, right
+
+
+def merge_similarity(left: Iterable[int], right: Iterable[int]) -> int:
+    """Sum of v * (times v is in right) over the distinct values v of left,
+    with both streams in ascending order, in one merge-join pass."""
+    total = 0
+    rights = itertools.groupby(right)
+    key, group = next(rights, (None, ()))
+    for value, _ in itertools.groupby(left):
+        while key is not None and key < value:
+            key, group = next(rights, (None, ()))
+        if key == value:
+            total += value * sum(1 for _ in group)
+            key, group = next(rights, (None, ()))
+    return total
+
+
+def external_distance(path: str | os.PathLike, run_size: int = 1_000_000) -> int:
+    """total_distance(*read_columns(path)) holding at most run_size rows,
+    plus a block of each sorted run, in memory at once."""
+    left, right = sorted_columns(path, run_size)
+    with left, right:
+        return sum(abs(a - b) for a, b in zip(left, right))
+
+
+def external_similarity(path: str | os.PathLike, run_size: int = 1_000_000) -> int:
+    """merge_similarity() of the columns of path, sorted as in
+    external_distance()."""
+    left, right = sorted_columns(path, run_size)
+    with left, right:
+        return merge_similarity(left, right)
+
+
+class KeyCounts:
+    """How often each of a fixed set of keys turns up in a stream; values
+    that are not keys are dropped as they arrive, so memory stays
+    proportional to the number of keys however long the stream runs."""
+
+    def __init__(self, keys: Iterable[int]) -> None:
+        keys = array("q", keys)
+        if np is not None:
+            # sorted, so update() can find keys with searchsorted
+            self.keys = _distinct(np.sort(np.frombuffer(keys, dtype=np.int64)))
+            self.counts = np.zeros(len(self.keys), dtype=np.int64)
+        else:
+            self._slots = {key: i for i, key in enumerate(dict.fromkeys(keys))}
+            self.keys = array("q", self._slots)
+            self.counts = array("q", bytes(8 * len(self.keys)))
+
+    def update(self, values: Iterable[int]) -> None:
+        values = array("q", values)
+        if np is not None:
+            if not len(self.keys):
+                return
+            found = np.frombuffer(values, dtype=np.int64)
+            at = np.searchsorted(self.keys, found).clip(max=len(self.keys) - 1)
+            at = at[self.keys[at] == found]
+            self.counts += np.bincount(at, minlength=len(self.keys))
+            return
+        slots, counts = self._slots, self.counts
+        for value in values:
+            slot = slots.get(value)
+            if slot is not None:
+                counts[slot] += 1
+
+    def similarity(self) -> int:
+        """similarity() of the keys and everything counted so far."""
+        if np is not None:
+            return int((self.keys * self.counts).sum())
+        return sum(map(operator.mul, self.keys, self.counts))
+
+
+def left_keys(path: str | os.PathLike, rows: int = 1_000_000) -> array:
+    """The distinct values of the left column of path, read rows at a time."""
+    if np is not None:
+        keys = np.empty(0, dtype=np.int64)
+        for left, _ in read_chunks(path, rows):
+            chunk = np.frombuffer(left, dtype=np.int64)
+            keys = _distinct(np.sort(np.concatenate((keys, chunk))))
+        return array("q", keys.tobytes())
+    found = set()
+    for left, _ in read_chunks(path, rows):
+        found.update(left)
+    return array("q", found)
+
+
+def streaming_similarity(path: str | os.PathLike, rows: int = 1_000_000) -> int:
+    """similarity(*read_columns(path)) holding only the distinct left values
+    and rows lines at a time: one pass collects the left keys, a second
+    streams the right column through KeyCounts."""
+    counts = KeyCounts(left_keys(path, rows))
+    for _, right in read_chunks(path, rows):
+        counts.update(right)
+    return counts.similarity()
+
+
+def sketch_similarity(
+    path: str | os.PathLike,
+    rows: int = 1_000_000,
+    width: int = 1 << 18,
+    depth: int = 4,
+) -> int:
+    """An estimate of similarity(*read_columns(path)) in fixed memory, for
+    when even the distinct left values are too many to hold: the right
+    column goes into a CountMinSketch and the left one through an
+    ExternalSorter, which yields its distinct values in order. The sketch
+    never undercounts, so with non-negative values this is never below the
+    exact score."""
+    sketch = CountMinSketch(width, depth)
+    with ExternalSorter(rows) as left:
+        for chunk_left, chunk_right in read_chunks(path, rows):
+            left.extend(chunk_left)
+            sketch.update(chunk_right)
+        keys = (key for key, _ in itertools.groupby(left))
+        total = 0
+        while block := array("q", itertools.islice(keys, rows)):
+            total += sum(map(operator.mul, block, sketch.estimates(block)))
+    return total
@@ -0,0 +1,113 @@
+"""Mapping a maze through an Intcode droid (2019 day 15) without guessing.
+
+The droid takes a move (1 north, 2 south, 3 west, 4 east) and answers
+WALL, MOVED or FOUND. DepthFirstExplorer plans the moves for a single
+droid: it steps into the first unknown neighbour and, when there is none,
+walks back the way it came, so every open cell is entered once and left
+once and exploration stops as soon as nothing unknown is reachable.
+explore_forking() maps the same maze without walking back at all: it
+forks the VM at every open cell and tries each direction from a copy.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from IntCode import IntcodeVM
+from Pathfinding import Pos
+
+NORTH, SOUTH, WEST, EAST = 1, 2, 3, 4
+WALL, MOVED, FOUND = 0, 1, 2
+
+MOVES: Dict[int, Pos] = {NORTH: (0, 1), SOUTH: (0, -1), WEST: (-1, 0), EAST: (1, 0)}
+REVERSE: Dict[int, int] = {NORTH: SOUTH, SOUTH: NORTH, WEST: EAST, EAST: WEST}
+
+
+def step(pos: Pos, move: int) -> Pos:
+    dx, dy = MOVES[move]
+    return (pos[0] + dx, pos[1] + dy)
+
+
+class DepthFirstExplorer:
+    """Chooses the droid's next move; feed every answer back to record().
+
+    cells maps every position tried so far to WALL, MOVED or FOUND.
+    """
+
+    def __init__(self, start: Pos = (0, 0)) -> None:
+        self.pos = start
+        self.cells: Dict[Pos, int] = {start: MOVED}
+        self.target: Optional[Pos] = None
+        # moves from start to pos, undone one by one to backtrack
+        self._trail: List[int] = []
+        self._move: Optional[int] = None
+        self._backtracking = False
+
+    def next_move(self) -> Optional[int]:
+        """The move to send, or None once everything reachable is mapped."""
+        for move in MOVES:
+            if step(self.pos, move) not in self.cells:
+                self._move, self._backtracking = move, False
+                return move
+        if not self._trail:
+            return None
+        self._move, self._backtracking = REVERSE[self._trail.pop()], True
+        return self._move
+
+    def record(self, status: int) -> None:
+        if self._move is None:
+            raise RuntimeError("record() without a move from next_move()")
+        target = step(self.pos, self._move)
+        if self._backtracking:
+            if status == WALL:
+                raise RuntimeError(f"wall at {target} on the way back")
+            self.pos = target
+        else:
+            self.cells[target] = status
+            if status == FOUND:
+                self.target = target
+            if status != WALL:
+                self.pos = target
+                self._trail.append(self._move)
+        self._move = None
+
+
+def explore(vm: IntcodeVM, start: Pos = (0, 0)) -> DepthFirstExplorer:
+    """Map the whole maze by driving vm with a DepthFirstExplorer."""
+    explorer = DepthFirstExplorer(start)
+    while (move := explorer.next_move()) is not None:
+        vm.send(move)
+        status = vm.run_until_output()
+        if status is None:
+            raise RuntimeError(f"droid stopped answering at {explorer.pos}")
+        explorer.record(status)
+    return explorer
+
+
+def explore_forking(
+    vm: IntcodeVM, start: Pos = (0, 0)
+) -> Tuple[Dict[Pos, int], Dict[Pos, int]]:
+    """Map the maze breadth-first from copies of vm instead of backtracking.
+
+    Every open cell keeps the VM that reached it; each unknown neighbour is
+    tried on a fork of it. Returns (cells, steps from start to every open
+    cell); vm itself never moves.
+    """
+    cells: Dict[Pos, int] = {start: MOVED}
+    dist = {start: 0}
+    todo = deque([(start, vm)])
+    while todo:
+        pos, droid = todo.popleft()
+        for move in MOVES:
+            target = step(pos, move)
+            if target in cells:
+                continue
+            child = droid.fork()
+            child.send(move)
+            status = child.run_until_output()
+            if status is None:
+                raise RuntimeError(f"droid stopped answering at {pos}")
+            cells[target] = status
+            if status != WALL:
+                dist[target] = dist[pos] + 1
+                todo.append((target, child))
+    return cells, dist
@@ -0,0 +1,262 @@
+"""Shortest paths and flood fills on 4-connected grids.
+
+Positions are (a, b) pairs in whatever order the caller keys its grid; the
+searches only ask a passable(pos) callback whether a cell can be entered.
+Each search keeps parent pointers in a dict that doubles as its visited
+set, so a path is rebuilt once at the end instead of copied at every step.
+"""
+
+import heapq
+from array import array
+from collections import deque
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from SparseGrid import SparseGrid
+from TiledGrid import TiledGrid
+
+Pos = Tuple[int, int]
+Passable = Callable[[Pos], bool]
+# cost of stepping from the first cell onto the second
+Cost = Callable[[Pos, Pos], int]
+
+STEPS: Tuple[Pos, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def grid_passable(
+    grid: Union[SparseGrid, TiledGrid],
+    walls: Collection[int] = (1,),
+    bounded: bool = True,
+) -> Passable:
+    """Cells whose value is not a wall; when bounded, only those inside the
+    grid's bounds_square() as it is at the time of the call."""
+    get = grid.get
+    walls = frozenset(walls)
+    if not bounded:
+        return lambda pos: get(*pos) not in walls
+    lo_a, hi_a, lo_b, hi_b = grid.bounds_square()
+    return lambda pos: (
+        lo_a <= pos[0] <= hi_a and lo_b <= pos[1] <= hi_b and get(*pos) not in walls
+    )
+
+
+def path_to(parents: Dict[Pos, Optional[Pos]], end: Pos) -> List[Pos]:
+    """Follow parent pointers back from end; the first cell has parent None."""
+    path = []
+    pos: Optional[Pos] = end
+    while pos is not None:
+        path.append(pos)
+        pos = parents[pos]
+    path.reverse()
+    return path
+
+
+def bfs(start: Pos, goal: Pos, passable: Passable) -> List[Pos]:
+    """Shortest path from start to goal, both included; [] if there is none."""
+    if not passable(start):
+        return []
+    parents: Dict[Pos, Optional[Pos]] = {start: None}
+    todo = deque([start])
+    while todo:
+        pos = todo.popleft()
+        if pos == goal:
+            return path_to(parents, pos)
+        a, b = pos
+        for da, db in STEPS:
+            nxt = (a + da, b + db)
+            if nxt not in parents and passable(nxt):
+                parents[nxt] = pos
+                todo.append(nxt)
+    return []
+
+
+def manhattan(p: Pos, q: Pos) -> int:
+    return abs(p[0] - q[0]) + abs(p[1] - q[1])
+
+
+def _best_first(
+    start: Pos,
+    goal: Pos,
+    passable: Passable,
+    cost: Optional[Cost],
+    heuristic: Callable[[Pos], int],
+) -> List[Pos]:
+    if not passable(start):
+        return []
+    parents: Dict[Pos, Optional[Pos]] = {start: None}
+    dist = {start: 0}
+    done = set()
+    heap = [(heuristic(start), 0, start)]
+    while heap:
+        _, d, pos = heapq.heappop(heap)
+        if pos in done:
+            continue
+        if pos == goal:
+            return path_to(parents, pos)
+        done.add(pos)
+        a, b = pos
+        for da, db in STEPS:
+            nxt = (a + da, b + db)
+            if nxt in done or not passable(nxt):
+                continue
+            nd = d + (1 if cost is None else cost(pos, nxt))
+            if nd < dist.get(nxt, nd + 1):
+                dist[nxt] = nd
+                parents[nxt] = pos
+                heapq.heappush(heap, (nd + heuristic(nxt), nd, nxt))
+    return []
+
+
+def dijkstra(
+    start: Pos, goal: Pos, passable: Passable, cost: Optional[Cost] = None
+) -> List[Pos]:
+    """Cheapest path from start to goal; every step costs 1 without cost."""
+    return _best_first(start, goal, passable, cost, lambda _: 0)
+
+
+def astar(
+    start: Pos, goal: Pos, passable: Passable, cost: Optional[Cost] = None
+) -> List[Pos]:
+    """dijkstra() guided by the Manhattan distance to goal, which never
+    overestimates as long as every step costs at least 1."""
+    return _best_first(start, goal, passable, cost, lambda pos: manhattan(pos, goal))
+
+
+def flood_fill(sources: Iterable[Pos], passable: Passable) -> Dict[Pos, int]:
+    """Steps from the nearest source to every cell reachable from one.
+
+    Sources are at distance 0 whether or not they are passable themselves;
+    the time for something to spread from them is max(result.values()).
+    """
+    dist = {pos: 0 for pos in sources}
+    todo = deque(dist)
+    while todo:
+        pos = todo.popleft()
+        d = dist[pos] + 1
+        a, b = pos
+        for da, db in STEPS:
+            nxt = (a + da, b + db)
+            if nxt not in dist and passable(nxt):
+                dist[nxt] = d
+                todo.append(nxt)
+    return dist
+
+
+class GridBitmap:
+    """The passable cells of a bounded area packed into a bytearray.
+
+    For searches that visit most of an area: cells become flat indices,
+    neighbours are index offsets and the visited set is a copy of the
+    bitmap, one byte per cell. A border of blocked cells around the area
+    saves the bounds checks.
+    """
+
+    def __init__(self, bounds: Tuple[int, int, int, int]) -> None:
+        """An area with every cell blocked; see from_passable and from_grid."""
+        lo_a, hi_a, lo_b, hi_b = bounds
+        self.origin = (lo_a - 1, lo_b - 1)
+        self.width = hi_b - lo_b + 3
+        self.height = hi_a - lo_a + 3
+        self.blocked = bytearray(b"\1") * (self.width * self.height)
+
+    def open_row(self, a: int, lo_b: int, passable: Iterable[bool]) -> None:
+        """Set the cells (a, lo_b), (a, lo_b + 1), ... to passable or not."""
+        start = self.index((a, lo_b))
+        blocked = bytes(not flag for flag in passable)
+        self.blocked[start : start + len(blocked)] = blocked
+
+    @classmethod
+    def from_passable(
+        cls, passable: Passable, bounds: Tuple[int, int, int, int]
+    ) -> "GridBitmap":
+        bitmap = cls(bounds)
+        lo_a, hi_a, lo_b, hi_b = bounds
+        for a in range(lo_a, hi_a + 1):
+            bitmap.open_row(a, lo_b, (passable((a, b)) for b in range(lo_b, hi_b + 1)))
+        return bitmap
+
+    @classmethod
+    def from_grid(
+        cls, grid: Union[SparseGrid, TiledGrid], walls: Collection[int] = (1,)
+    ) -> "GridBitmap":
+        """Non-wall cells inside the grid's bounds_square(), a row at a time."""
+        bounds = grid.bounds_square()
+        bitmap = cls(bounds)
+        lo_a, hi_a, lo_b, hi_b = bounds
+        walls = frozenset(walls)
+        for a in range(lo_a, hi_a + 1):
+            row = grid.row(a, lo_b, hi_b + 1)
+            bitmap.open_row(a, lo_b, (val not in walls for val in row))
+        return bitmap
+
+    def index(self, pos: Pos) -> int:
+        return (pos[0] - self.origin[0]) * self.width + pos[1] - self.origin[1]
+
+    def pos(self, index: int) -> Pos:
+        a, b = divmod(index, self.width)
+        return (a + self.origin[0], b + self.origin[1])
+
+    def _inside(self, pos: Pos) -> bool:
+        a, b = pos[0] - self.origin[0], pos[1] - self.origin[1]
+        return 0 < a < self.height - 1 and 0 < b < self.width - 1
+
+    def bfs(self, start: Pos, goal: Pos) -> List[Pos]:
+        """Same as bfs() over the bitmap's passable cells."""
+        if not (self._inside(start) and self._inside(goal)):
+            return []
+        if self.blocked[self.index(start)]:
+            return []
+        seen = bytearray(self.blocked)
+        parent = array("q", [-1]) * len(seen)
+        first, last = self.index(start), self.index(goal)
+        w = self.width
+        steps = (-w, w, -1, 1)
+        seen[first] = 1
+        todo = deque([first])
+        while todo:
+            i = todo.popleft()
+            if i == last:
+                path = []
+                while i != -1:
+                    path.append(self.pos(i))
+                    i = parent[i]
+                path.reverse()
+                return path
+            for step in steps:
+                j = i + step
+                if not seen[j]:
+                    seen[j] = 1
+                    parent[j] = i
+                    todo.append(j)
+        return []
+
+    def flood_fill(self, sources: Iterable[Pos]) -> Dict[Pos, int]:
+        """Same as flood_fill() over the bitmap's passable cells; sources
+        outside the area are ignored."""
+        seen = bytearray(self.blocked)
+        dist = array("q", [0]) * len(seen)
+        order = list({self.index(pos): None for pos in sources if self._inside(pos)})
+        for i in order:
+            seen[i] = 1
+        todo = deque(order)
+        w = self.width
+        steps = (-w, w, -1, 1)
+        while todo:
+            i = todo.popleft()
+            d = dist[i] + 1
+            for step in steps:
+                j = i + step
+                if not seen[j]:
+                    seen[j] = 1
+                    dist[j] = d
+                    todo.append(j)
+                    order.append(j)
+        return {self.pos(i): dist[i] for i in order}
@@ -0,0 +1,39 @@
+"""Safety checks for the level reports of 2024 day 2.
+
+A report is safe when its levels strictly increase or strictly decrease,
+by 1 to 3 at every step. valid_with_single_mod() also accepts reports that
+become safe once a single level is removed. It runs in linear time: the
+first step that breaks the rule for a direction has to lose one of its
+two levels, so only those two removals are worth checking, per direction.
+"""
+
+from typing import Sequence
+
+
+def _first_bad(nums: Sequence[int], sign: int, skip: int = -1) -> int:
+    # index of the first level whose step from the previous kept level
+    # breaks the rule, ignoring level skip; len(nums) if there is none
+    prev = None
+    for i, value in enumerate(nums):
+        if i == skip:
+            continue
+        if prev is not None and not 1 <= sign * (value - prev) <= 3:
+            return i
+        prev = value
+    return len(nums)
+
+
+def is_valid_sequence(nums: Sequence[int]) -> bool:
+    return any(_first_bad(nums, sign) == len(nums) for sign in (1, -1))
+
+
+def valid_with_single_mod(nums: Sequence[int]) -> bool:
+    """Whether nums is safe with at most one level removed."""
+    for sign in (1, -1):
+        bad = _first_bad(nums, sign)
+        if bad == len(nums):
+            return True
+        # the step into nums[bad] fails, so drop it or the level before
+        if any(_first_bad(nums, sign, skip) == len(nums) for skip in (bad - 1, bad)):
+            return True
+    return False
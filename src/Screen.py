@@ -0,0 +1,136 @@
+import sys
+import time
+from typing import Dict, Optional, Set, TextIO, Tuple
+
+Bounds = Tuple[int, int, int, int]
+
+
+class Screen:
+    """A character grid that solvers draw into and that decides when to show it.
+
+    set() and set_status() only record changes; frame() marks the end of an
+    update and draws if the screen is due. A headless screen never draws, so
+    a solver pays only for a dict write per cell. Otherwise a frame is drawn
+    once at least `every` frames and `interval` seconds have passed since the
+    last one. With ansi on, frames after the first move the cursor to each
+    changed cell instead of reprinting the grid, and only repaint everything
+    when the grid's bounds grow; with ansi off every frame is printed in full.
+    """
+
+    def __init__(
+        self,
+        headless: bool = False,
+        every: int = 1,
+        interval: float = 0.0,
+        ansi: bool = True,
+        blank: str = " ",
+        out: Optional[TextIO] = None,
+    ) -> None:
+        self.headless = headless
+        self.every = every
+        self.interval = interval
+        self.ansi = ansi
+        self.blank = blank
+        self.out = sys.stdout if out is None else out
+        self.cells: Dict[Tuple[int, int], str] = {}
+        self.status = ""
+        # min_x, min_y, max_x, max_y of every cell ever set
+        self.bounds: Optional[Bounds] = None
+        self._dirty: Set[Tuple[int, int]] = set()
+        self._status_dirty = False
+        self._drawn: Optional[Bounds] = None
+        self._frames = 0
+        self._last = float("-inf")
+
+    def set(self, x: int, y: int, ch: str) -> None:
+        cells = self.cells
+        if cells.get((x, y)) == ch:
+            return
+        cells[x, y] = ch
+        bounds = self.bounds
+        if bounds is None:
+            self.bounds = (x, y, x, y)
+        elif not (bounds[0] <= x <= bounds[2] and bounds[1] <= y <= bounds[3]):
+            self.bounds = (
+                min(bounds[0], x),
+                min(bounds[1], y),
+                max(bounds[2], x),
+                max(bounds[3], y),
+            )
+        if not self.headless:
+            self._dirty.add((x, y))
+
+    def set_status(self, text: str) -> None:
+        if text != self.status:
+            self.status = text
+            self._status_dirty = True
+
+    def frame(self) -> None:
+        if self.headless:
+            return
+        self._frames += 1
+        if self._frames < self.every:
+            return
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return
+        self._frames = 0
+        self._last = now
+        self.draw()
+
+    def draw(self) -> None:
+        """Show the current state now, whatever the frame limits say."""
+        if self.headless or self.bounds is None:
+            return
+        if not self.ansi or self._drawn != self.bounds:
+            text = self.render() + "\n" + self.status + "\n"
+            if self.ansi:
+                # home the cursor and clear, then paint everything
+                text = "\x1b[H\x1b[2J" + text
+            else:
+                text += "\n"
+            self._drawn = self.bounds
+        else:
+            min_x, min_y, _, max_y = self.bounds
+            parts = [
+                f"\x1b[{y - min_y + 1};{x - min_x + 1}H{self.cells[x, y]}"
+                for x, y in self._dirty
+            ]
+            height = max_y - min_y + 1
+            if self._status_dirty:
+                parts.append(f"\x1b[{height + 1};1H\x1b[2K{self.status}")
+            # park the cursor below the picture
+            parts.append(f"\x1b[{height + 2};1H")
+            text = "".join(parts)
+        self._dirty.clear()
+        self._status_dirty = False
+        self.out.write(text)
+        self.out.flush()
+
+    def render(self) -> str:
+        if self.bounds is None:
+            return ""
+        min_x, min_y, max_x, max_y = self.bounds
+        get = self.cells.get
+        blank = self.blank
+        return "\n".join(
+            "".join(get((x, y), blank) for x in range(min_x, max_x + 1))
+            for y in range(min_y, max_y + 1)
+        )
+
+
+MODES = ("headless", "live", "every", "plain")
+
+
+def make_screen(mode: str, blank: str = " ") -> Screen:
+    """headless: never draw; live: ANSI updates at up to 30 fps; every: ANSI
+    update after every frame; plain: full reprint after every frame."""
+    if mode == "headless":
+        return Screen(headless=True, blank=blank)
+    if mode == "live":
+        return Screen(interval=1 / 30, blank=blank)
+    if mode == "every":
+        return Screen(blank=blank)
+    if mode == "plain":
+        return Screen(ansi=False, blank=blank)
+    raise ValueError(f"Unknown screen mode {mode!r}, expected one of {MODES}")
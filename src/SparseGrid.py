@@ -1,8 +1,82 @@
-from typing import Dict, Tuple
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
 
 
-class SparseGrid:
+class GridBounds:
+    """Bounds of the non-zero cells of a grid, kept up to date by its set().
+
+    Filling a cell widens the bounds. Clearing one only decrements per-row
+    and per-column counts; if that empties an edge row or column the bounds
+    are recomputed from the counts on the next query. Bounds queries are O(1)
+    amortized instead of a scan of every cell.
+    """
+
     def __init__(self) -> None:
+        # number of non-zero cells in each row (y) and column (x)
+        self._rows: Dict[int, int] = {}
+        self._cols: Dict[int, int] = {}
+        # (min_y, max_y, min_x, max_x), or None when empty
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+        self._stale = False
+
+    def _count(self, y: int, x: int) -> None:
+        rows, cols = self._rows, self._cols
+        rows[y] = rows.get(y, 0) + 1
+        cols[x] = cols.get(x, 0) + 1
+        if self._stale:
+            return
+        bounds = self._bounds
+        if bounds is None:
+            self._bounds = (y, y, x, x)
+        elif not (bounds[0] <= y <= bounds[1] and bounds[2] <= x <= bounds[3]):
+            self._bounds = (
+                min(bounds[0], y),
+                max(bounds[1], y),
+                min(bounds[2], x),
+                max(bounds[3], x),
+            )
+
+    def _forget(self, y: int, x: int) -> None:
+        rows, cols = self._rows, self._cols
+        bounds = self._bounds
+        rows[y] -= 1
+        if rows[y] == 0:
+            del rows[y]
+            if bounds is not None and (y == bounds[0] or y == bounds[1]):
+                self._stale = True
+        cols[x] -= 1
+        if cols[x] == 0:
+            del cols[x]
+            if bounds is not None and (x == bounds[2] or x == bounds[3]):
+                self._stale = True
+
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """(min_y, max_y, min_x, max_x) of the non-zero cells, None if empty."""
+        if self._stale:
+            rows, cols = self._rows, self._cols
+            self._bounds = (
+                (min(rows), max(rows), min(cols), max(cols)) if rows else None
+            )
+            self._stale = False
+        return self._bounds
+
+    def bounds_square(self) -> Tuple[int, int, int, int]:
+        bounds = self.bounds()
+        if bounds is None:
+            return (0, 0, 0, 0)
+        min_y, max_y, min_x, max_x = bounds
+
+        h = max_y - min_y + 1
+        w = max_x - min_x + 1
+        side = max(h, w)
+        return (min_y, min_y + side - 1, min_x, min_x + side - 1)
+
+
+class SparseGrid(GridBounds):
+    """Sparse grid of ints keyed by (y, x); unset cells read as 0."""
+
+    def __init__(self) -> None:
+        super().__init__()
         self._map: Dict[Tuple[int, int], int] = {}
 
     def get(self, y: int, x: int) -> int:
@@ -10,28 +84,32 @@ class SparseGrid:
 
     def set(self, y: int, x: int, value: int) -> None:
         if value == 0:
-            self._map.pop((y, x), None)
+            if self._map.pop((y, x), None) is not None:
+                self._forget(y, x)
         else:
+            if (y, x) not in self._map:
+                self._count(y, x)
             self._map[(y, x)] = value
 
-    def bounds_square(self) -> Tuple[int, int, int, int]:
-        if not self._map:
-            return (0, 0, 0, 0)
-        ys = [y for (y, _), v in self._map.items() if v != 0]
-        xs = [x for (_, x), v in self._map.items() if v != 0]
-        min_y, max_y = min(ys), max(ys)
-        min_x, max_x = min(xs), max(xs)
+    def row(self, y: int, x0: int, x1: int) -> array:
+        """Values of row y for x0 <= x < x1."""
+        get = self._map.get
+        return array("q", [get((y, x), 0) for x in range(x0, x1)])
 
-        h = max_y - min_y + 1
-        w = max_x - min_x + 1
-        side = max(h, w)
-        return (min_y, min_y + side - 1, min_x, min_x + side - 1)
+    def region(
+        self, y0: int, y1: int, x0: int, x1: int
+    ) -> Iterator[Tuple[int, int, int]]:
+        """(y, x, value) of the non-zero cells with y0 <= y < y1, x0 <= x < x1."""
+        for (y, x), value in self._map.items():
+            if y0 <= y < y1 and x0 <= x < x1:
+                yield y, x, value
 
     def render(self) -> None:
         min_y, max_y, min_x, max_x = self.bounds_square()
         ys = range(min_y - 1, max_y + 1)
+        get = self.get
 
         for y in ys:
-            row = "".join(str(self.get(x, y)) for x in range(min_x - 1, max_x + 1))
+            row = "".join(str(get(x, y)) for x in range(min_x - 1, max_x + 1))
             print(row)
         print("")
@@ -0,0 +1,115 @@
+from array import array
+from typing import Dict, Iterator, Tuple
+
+from SparseGrid import GridBounds
+
+# tiles are TILE x TILE cells, stored row-major in one array
+SHIFT = 6
+TILE = 1 << SHIFT
+MASK = TILE - 1
+
+
+class TiledGrid(GridBounds):
+    """SparseGrid with cells stored in fixed-size tiles instead of a dict.
+
+    Cells live in TILE x TILE arrays of the given typecode, kept in a dict
+    keyed by tile coordinate (y >> SHIFT, x >> SHIFT). A cell costs a few
+    bytes instead of a tuple key and a dict entry, and row() and region()
+    slice whole tile rows instead of looking up every cell. Tiles are
+    allocated when their first cell is filled and dropped when their last
+    one is cleared. Values must fit the typecode ("q": int64, "B": 0-255);
+    set() raises OverflowError otherwise, leaving the grid unchanged.
+    """
+
+    def __init__(self, typecode: str = "q") -> None:
+        super().__init__()
+        self.typecode = typecode
+        self._tiles: Dict[Tuple[int, int], array] = {}
+        # number of non-zero cells in each tile
+        self._filled: Dict[Tuple[int, int], int] = {}
+        self._blank = array(typecode, [0]) * (TILE * TILE)
+
+    def get(self, y: int, x: int) -> int:
+        tile = self._tiles.get((y >> SHIFT, x >> SHIFT))
+        if tile is None:
+            return 0
+        return tile[(y & MASK) << SHIFT | (x & MASK)]
+
+    def set(self, y: int, x: int, value: int) -> None:
+        key = (y >> SHIFT, x >> SHIFT)
+        i = (y & MASK) << SHIFT | (x & MASK)
+        tile = self._tiles.get(key)
+        if tile is None:
+            if value == 0:
+                return
+            tile = self._blank[:]
+            tile[i] = value
+            self._tiles[key] = tile
+            self._filled[key] = 1
+            self._count(y, x)
+            return
+        old = tile[i]
+        tile[i] = value
+        if old == 0:
+            if value != 0:
+                self._filled[key] += 1
+                self._count(y, x)
+        elif value == 0:
+            self._forget(y, x)
+            self._filled[key] -= 1
+            if self._filled[key] == 0:
+                del self._tiles[key], self._filled[key]
+
+    def row(self, y: int, x0: int, x1: int) -> array:
+        """Values of row y for x0 <= x < x1."""
+        out = array(self.typecode)
+        tiles = self._tiles
+        ty = y >> SHIFT
+        base = (y & MASK) << SHIFT
+        x = x0
+        while x < x1:
+            end = min(x1, ((x >> SHIFT) + 1) << SHIFT)
+            tile = tiles.get((ty, x >> SHIFT))
+            if tile is None:
+                out.extend(self._blank[: end - x])
+            else:
+                lo = base + (x & MASK)
+                out.extend(tile[lo : lo + end - x])
+            x = end
+        return out
+
+    def region(
+        self, y0: int, y1: int, x0: int, x1: int
+    ) -> Iterator[Tuple[int, int, int]]:
+        """(y, x, value) of the non-zero cells with y0 <= y < y1, x0 <= x < x1,
+        tile by tile; tiles that were never filled are skipped."""
+        if y0 >= y1 or x0 >= x1:
+            return
+        tiles = self._tiles
+        for ty in range(y0 >> SHIFT, ((y1 - 1) >> SHIFT) + 1):
+            for tx in range(x0 >> SHIFT, ((x1 - 1) >> SHIFT) + 1):
+                tile = tiles.get((ty, tx))
+                if tile is None:
+                    continue
+                top, left = ty << SHIFT, tx << SHIFT
+                lo_x = max(x0, left) - left
+                hi_x = min(x1, left + TILE) - left
+                for y in range(max(y0, top), min(y1, top + TILE)):
+                    base = (y - top) << SHIFT
+                    chunk = tile[base + lo_x : base + hi_x]
+                    if not any(chunk):
+                        continue
+                    for dx, value in enumerate(chunk):
+                        if value:
+                            yield y, left + lo_x + dx, value
+
+    def render(self) -> None:
+        # the same picture as SparseGrid.render, which prints the grid
+        # transposed: its line y holds get(x, y) for each x
+        min_y, max_y, min_x, max_x = self.bounds_square()
+        columns = [
+            self.row(x, min_y - 1, max_y + 1) for x in range(min_x - 1, max_x + 1)
+        ]
+        for line in zip(*columns):
+            print("".join(map(str, line)))
+        print("")
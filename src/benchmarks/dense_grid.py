@@ -0,0 +1,79 @@
+import random
+import time
+from typing import Callable, List, Tuple
+
+import DenseGrid
+from DenseGrid import DenseGrid as Dense
+
+SCAFFOLD = ord("#")
+
+
+def scaffold(side: int, seed: int = 0) -> List[List[int]]:
+    # random horizontal and vertical runs, so there are plenty of crossings
+    rng = random.Random(seed)
+    rows = [[ord(".")] * side for _ in range(side)]
+    for _ in range(side):
+        y, x, length = rng.randrange(side), rng.randrange(side), rng.randrange(side)
+        for i in range(length):
+            if rng.random() < 0.5:
+                rows[y][min(side - 1, x + i)] = SCAFFOLD
+            else:
+                rows[min(side - 1, y + i)][x] = SCAFFOLD
+    return rows
+
+
+def looped(rows: List[List[int]]) -> List[Tuple[int, int]]:
+    # the per-cell loop y19d17 used before
+    crossings = []
+    height, width = len(rows), len(rows[0])
+    for r in range(height):
+        for c in range(width):
+            if rows[r][c] != SCAFFOLD:
+                continue
+            neighbours = 0
+            for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < height and 0 <= nc < width and rows[nr][nc] == SCAFFOLD:
+                    neighbours += 1
+            if neighbours > 2:
+                crossings.append((r, c))
+    return crossings
+
+
+def swept(rows: List[List[int]]) -> List[Tuple[int, int]]:
+    dense = Dense.from_rows(rows)
+    on = dense.mask(lambda val: val == SCAFFOLD)
+    counts = dense.neighbour_counts(on)
+    return dense.where(dense.mask(lambda val, n: (val == SCAFFOLD) & (n > 2), counts))
+
+
+def best_time(find: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        find()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    if DenseGrid.np is None:
+        print("numpy is not installed; DenseGrid runs its list fallback")
+    for side in (100, 500, 1000):
+        rows = scaffold(side)
+        assert swept(rows) == looped(rows)
+        loop = best_time(lambda: looped(rows))
+        sweep = best_time(lambda: swept(rows))
+        dense = Dense.from_rows(rows)
+        on = dense.mask(lambda val: val == SCAFFOLD)
+        label = best_time(lambda: dense.label(on))
+        print(
+            f"{side}x{side}: loop {loop * 1000:.1f} ms, "
+            f"sweep {sweep * 1000:.1f} ms, {loop / sweep:.1f}x; "
+            f"label {label * 1000:.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
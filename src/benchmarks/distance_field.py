@@ -0,0 +1,79 @@
+import random
+import time
+from typing import List, Set, Tuple
+
+from benchmarks.mazes import WALL, maze_rows
+from DistanceField import DistanceField
+from Pathfinding import Pos, bfs
+
+Event = Tuple[bool, Pos]
+
+
+def exploration(cells: int, closes: int, seed: int = 0) -> List[Event]:
+    """(opened, cell) in the order a depth-first explorer would find the open
+    cells of a looped maze, with some already open cells walled up later."""
+    rng = random.Random(seed)
+    rows = maze_rows(cells, seed, loops=0.1)
+    seen = {(1, 1)}
+    stack = [(1, 1)]
+    events: List[Event] = []
+    while stack:
+        a, b = stack.pop()
+        events.append((True, (a, b)))
+        for nxt in ((a - 1, b), (a + 1, b), (a, b - 1), (a, b + 1)):
+            if nxt not in seen and rows[nxt[0]][nxt[1]] != WALL:
+                seen.add(nxt)
+                stack.append(nxt)
+    for _ in range(closes):
+        at = rng.randrange(len(events) // 2, len(events))
+        events.insert(at, (False, events[rng.randrange(1, at)][1]))
+    return events
+
+
+def incremental(events: List[Event], target: Pos) -> List[int]:
+    field = DistanceField((1, 1))
+    found = []
+    for opened, cell in events:
+        if opened:
+            field.open(cell)
+        else:
+            field.close(cell)
+        distance = field.distance(target)
+        found.append(-1 if distance is None else distance)
+    return found
+
+
+def researched(events: List[Event], target: Pos) -> List[int]:
+    known: Set[Pos] = set()
+    found = []
+    for opened, cell in events:
+        if opened:
+            known.add(cell)
+        else:
+            known.discard(cell)
+        path = bfs((1, 1), target, known.__contains__)
+        found.append(len(path) - 1 if path else -1)
+    return found
+
+
+def main() -> int:
+    for cells in (10, 20, 40):
+        events = exploration(cells, closes=cells)
+        target = (2 * cells - 1, 2 * cells - 1)
+        start = time.perf_counter()
+        fast = incremental(events, target)
+        mid = time.perf_counter()
+        slow = researched(events, target)
+        end = time.perf_counter()
+        assert fast == slow
+        print(
+            f"{2 * cells + 1}x{2 * cells + 1} maze, {len(events)} updates: "
+            f"search every step {(end - mid) * 1000:.1f} ms, "
+            f"distance field {(mid - start) * 1000:.1f} ms, "
+            f"{(end - mid) / (mid - start):.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
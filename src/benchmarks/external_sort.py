@@ -0,0 +1,75 @@
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Tuple
+
+from benchmarks.location_lists import write_lists
+from LocationLists import external_distance, external_similarity
+
+RUN_SIZE = 1 << 16
+
+
+def list_similarity(path: pathlib.Path) -> int:
+    # what d2_2 does in memory: boxed ints in lists, then Counters
+    left, right = [], []
+    with open(path) as f:
+        for line in f:
+            a, b = line.split()
+            left.append(int(a))
+            right.append(int(b))
+    left.sort()
+    right.sort()
+    counts = Counter(right)
+    return sum(key * counts[key] for key in set(left))
+
+
+def list_distance(path: pathlib.Path) -> int:
+    left, right = [], []
+    with open(path) as f:
+        for line in f:
+            a, b = line.split()
+            left.append(int(a))
+            right.append(int(b))
+    return sum(abs(a - b) for a, b in zip(sorted(left), sorted(right)))
+
+
+def traced(compute: Callable[[], int]) -> Tuple[float, float, int]:
+    """(seconds, peak MiB allocated, result)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = compute()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1 << 20), result
+
+
+def main(*sizes: str) -> int:
+    """Row counts to try; tracing allocations slows everything down, so the
+    times are only comparable with each other."""
+    rows_list = [int(size) for size in sizes] or [10**5, 10**6]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            path = pathlib.Path(tmp) / f"lists_{rows}.txt"
+            write_lists(path, rows)
+            print(f"{rows:,} rows, external runs of {RUN_SIZE:,}")
+            for name, in_lists, external in (
+                ("distance", list_distance, external_distance),
+                ("similarity", list_similarity, external_similarity),
+            ):
+                t_lists, m_lists, expected = traced(lambda: in_lists(path))
+                t_ext, m_ext, result = traced(lambda: external(path, RUN_SIZE))
+                assert result == expected
+                print(
+                    f"  {name}: lists {t_lists:.2f}s peak {m_lists:.1f} MiB, "
+                    f"external {t_ext:.2f}s peak {m_ext:.1f} MiB"
+                )
+            path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
@@ -0,0 +1,69 @@
+import time
+from typing import Callable, List, Sequence, Tuple
+
+import IntCode
+from benchmarks.programs import countdown_sum, nested_products
+from IntCode import OP, IntcodeVM
+
+Decoder = Callable[[int], Tuple[OP, Sequence[int]]]
+
+
+def legacy_decode(word: int) -> Tuple[OP, List[int]]:
+    # the decoder run_intcode used before the cache: fresh modes list plus a
+    # linear scan over the enum for every instruction executed
+    code = word % 100
+    word = word // 100
+    modes = [0, 0, 0, 0]
+    for i in range(3):
+        modes[i] = word % 10
+        word = word // 10
+    return (next((op for op in OP if op.code == code), OP.HALT), modes)
+
+
+def run_with_decoder(program: List[int], decode: Decoder) -> None:
+    vm = IntcodeVM(dict(enumerate(program)))
+    vm._decoder = decode
+    vm.run(out_f=lambda _: None)
+
+
+def count_instructions(program: List[int]) -> int:
+    count = 0
+
+    def counting_decode(word: int) -> Tuple[OP, List[int]]:
+        nonlocal count
+        count += 1
+        return legacy_decode(word)
+
+    run_with_decoder(program, counting_decode)
+    return count
+
+
+def best_time(program: List[int], decode: Decoder, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_with_decoder(program, decode)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    programs = {
+        "countdown_sum(100000)": countdown_sum(100_000),
+        "nested_products(300)": nested_products(300),
+    }
+    for name, program in programs.items():
+        instructions = count_instructions(program)
+        before = best_time(program, legacy_decode)
+        after = best_time(program, IntCode._DECODERS["day9"])
+        print(
+            f"{name}: {instructions:,} instructions, "
+            f"before {instructions / before:,.0f} ips, "
+            f"after {instructions / after:,.0f} ips, "
+            f"{before / after:.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,38 @@
+import time
+from typing import List
+
+from benchmarks.intcode_decode import count_instructions
+from benchmarks.programs import countdown_sum, nested_products
+from IntCode import ENGINES, Memory, run_intcode
+
+
+def best_time(program: List[int], engine: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        mem = Memory(program)
+        start = time.perf_counter()
+        run_intcode(mem, out_f=lambda _: None, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    programs = {
+        "countdown_sum(300000)": countdown_sum(300_000),
+        "nested_products(500)": nested_products(500),
+    }
+    for name, program in programs.items():
+        instructions = count_instructions(program)
+        times = {engine: best_time(program, engine) for engine in ENGINES}
+        report = ", ".join(
+            f"{engine} {instructions / t:,.0f} ips" for engine, t in times.items()
+        )
+        print(
+            f"{name}: {instructions:,} instructions, {report}, "
+            f"{times['interp'] / times['compiled']:.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+import pathlib
+import time
+from typing import List
+
+import IntCode
+from benchmarks.programs import countdown_sum, nested_products
+from IntCode import IntcodeVM, Memory
+from IntCodeLoader import load_program
+from IntCodeProfiler import ProfiledVM
+
+BOOST = pathlib.Path(__file__).parent.parent / "y19d9p2" / "input.txt"
+
+
+def run(program: List[int], inputs: List[int], engine: str) -> None:
+    vm = IntcodeVM(Memory(program), engine)
+    vm.send(*inputs)
+    vm.run(out_f=lambda _: None)
+
+
+def count_instructions(program: List[int], inputs: List[int]) -> int:
+    vm = ProfiledVM(Memory(program))
+    vm.send(*inputs)
+    vm.run(out_f=lambda _: None)
+    return vm.stats.steps
+
+
+def best_time(
+    program: List[int], inputs: List[int], fuse: bool, repeat: int = 5
+) -> float:
+    original = IntCode._FUSE
+    IntCode._FUSE = fuse
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(program, inputs, "compiled")
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        IntCode._FUSE = original
+
+
+def main() -> int:
+    boost = load_program(BOOST)
+    programs = {
+        "countdown_sum(300000)": (countdown_sum(300_000), []),
+        "nested_products(500)": (nested_products(500), []),
+        "BOOST sensor mode": (boost, [2]),
+    }
+    for name, (program, inputs) in programs.items():
+        instructions = count_instructions(program, inputs)
+        blocks = best_time(program, inputs, fuse=False)
+        fused = best_time(program, inputs, fuse=True)
+        print(
+            f"{name}: {instructions:,} instructions, "
+            f"blocks {instructions / blocks:,.0f} ips, "
+            f"fused {instructions / fused:,.0f} ips, "
+            f"{blocks / fused:.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+import pathlib
+import random
+import tempfile
+import time
+from typing import Callable
+
+from IntCodeLoader import cache_path, load_program, parse_program
+
+
+def best_time(load: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for cells in (10_000, 1_000_000):
+            path = pathlib.Path(tmp) / f"program_{cells}.txt"
+            values = (rng.randrange(-(10**9), 10**9) for _ in range(cells))
+            path.write_text(",".join(map(str, values)) + "\n", encoding="utf-8")
+
+            text = path.read_text(encoding="utf-8")
+            legacy = best_time(
+                lambda: [
+                    int(p.strip()) for p in text.replace("\n", ",").split(",") if p
+                ]
+            )
+            parse = best_time(lambda: parse_program(path.read_text(encoding="utf-8")))
+            load_program(path)  # writes the image
+            assert cache_path(path).exists()
+            cached = best_time(lambda: load_program(path))
+            print(
+                f"{cells:,} cells: legacy parse {legacy * 1000:.2f} ms, "
+                f"parse_program {parse * 1000:.2f} ms, "
+                f"cached image {cached * 1000:.2f} ms, {legacy / cached:.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
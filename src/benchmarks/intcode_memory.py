@@ -0,0 +1,75 @@
+import pathlib
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.intcode_engines import best_time
+from benchmarks.programs import nested_products
+from IntCode import Memory, run_intcode
+from IntCodeLoader import load_program
+
+GAME = pathlib.Path(__file__).parent.parent / "y19d12" / "input.txt"
+
+
+def allocated(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def lookup_time(read: Callable[[int], int], addrs: List[int]) -> float:
+    start = time.perf_counter()
+    for addr in addrs:
+        read(addr)
+    return time.perf_counter() - start
+
+
+def dict_run_time(program: List[int], engine: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        mem: Dict[int, int] = dict(enumerate(program))
+        start = time.perf_counter()
+        run_intcode(mem, out_f=lambda _: None, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    images = {
+        "y19d12 program": load_program(GAME),
+        "1M cells": [random.randrange(-(2**40), 2**40) for _ in range(1_000_000)],
+    }
+    for name, image in images.items():
+        as_dict = allocated(lambda: dict(enumerate(image)))
+        as_memory = allocated(lambda: Memory(image))
+        print(
+            f"{name}: dict {as_dict / 1024:,.0f} KiB, "
+            f"Memory {as_memory / 1024:,.0f} KiB ({as_dict / as_memory:.1f}x smaller)"
+        )
+
+        addrs = [random.randrange(len(image)) for _ in range(1_000_000)]
+        mem_dict = dict(enumerate(image))
+        memory = Memory(image)
+        dense = memory.dense
+        print(
+            f"  1M reads: dict.get {lookup_time(lambda a: mem_dict.get(a, 0), addrs):.3f}s, "
+            f"Memory.get {lookup_time(memory.get, addrs):.3f}s, "
+            f"dense index {lookup_time(dense.__getitem__, addrs):.3f}s"
+        )
+
+    program = nested_products(400)
+    for engine in ("interp", "compiled"):
+        print(
+            f"nested_products(400) {engine}: "
+            f"dict {dict_run_time(program, engine):.3f}s, "
+            f"Memory {best_time(program, engine):.3f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+import time
+from typing import List
+
+from benchmarks.intcode_fusion import BOOST, count_instructions, run
+from benchmarks.programs import countdown_sum, nested_products
+from IntCodeLoader import load_program
+from IntCodeNative import library
+
+
+def best_time(
+    program: List[int], inputs: List[int], engine: str, repeat: int = 3
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(program, inputs, engine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    if library() is None:
+        print("native kernel could not be built; it would fall back to interp")
+        return 1
+    boost = load_program(BOOST)
+    programs = {
+        "countdown_sum(1000000)": (countdown_sum(1_000_000), []),
+        "nested_products(1000)": (nested_products(1000), []),
+        "BOOST sensor mode": (boost, [2]),
+    }
+    for name, (program, inputs) in programs.items():
+        instructions = count_instructions(program, inputs)
+        times = {
+            engine: best_time(program, inputs, engine)
+            for engine in ("compiled", "native")
+        }
+        report = ", ".join(
+            f"{engine} {instructions / t:,.0f} ips" for engine, t in times.items()
+        )
+        print(
+            f"{name}: {instructions:,} instructions, {report}, "
+            f"{times['compiled'] / times['native']:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+import time
+from typing import List
+
+from benchmarks.programs import assemble
+from IntCode import IntcodeVM, Memory
+from IntCodeScheduler import IntcodeScheduler
+
+
+def relay(spin: int, limit: int) -> List[int]:
+    """Read x, spin for a while, pass on x + 1; halt on reading limit."""
+    return assemble(
+        f"""
+        loop:
+            in x
+            lt x #{limit} c
+            jf c #end
+            add #{spin} #0 n
+        spin:
+            add n #-1 n
+            jt n #spin
+            add x #1 x
+            out x
+            jt #1 #loop
+        end:
+            halt
+        """
+    )
+
+
+def single_vm(program: List[int], tokens: int, engine: str) -> float:
+    # the same number of hops fed straight back into one machine
+    start = time.perf_counter()
+    for _ in range(tokens):
+        vm = IntcodeVM(Memory(program), engine)
+        vm.send(0)
+        while not vm.halted:
+            vm.send(*vm.run_until_input())
+    return time.perf_counter() - start
+
+
+def ring(program: List[int], nodes: int, tokens: int, engine: str) -> float:
+    scheduler = IntcodeScheduler(slice_steps=20_000)
+    ids = [scheduler.add(IntcodeVM(Memory(program), engine)) for _ in range(nodes)]
+    for i in ids:
+        scheduler.connect(i, (i + 1) % nodes)
+    for i in range(tokens):
+        scheduler.send(ids[i * nodes // tokens], 0)
+    start = time.perf_counter()
+    scheduler.run()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    hops = 500
+    program = relay(spin=50, limit=hops)
+    for engine in ("interp", "compiled"):
+        baseline = single_vm(program, 1, engine)
+        print(f"{engine}: 1 machine, {hops} hops: {baseline:.3f}s")
+        for nodes, tokens in ((50, 1), (50, 50), (100, 100)):
+            elapsed = ring(program, nodes, tokens, engine)
+            work = baseline * tokens
+            print(
+                f"  ring of {nodes}, {tokens} token(s): {elapsed:.3f}s "
+                f"for {work:.3f}s of single-machine work ({elapsed / work:.2f}x)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+import pathlib
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional, Tuple
+
+import LocationLists
+from LocationLists import external_distance, read_columns, total_distance
+
+Smallest = Tuple[Optional[int], List[int]]
+
+
+def write_lists(
+    path: pathlib.Path, rows: int, seed: int = 0, low: int = 10**5, high: int = 10**6
+) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for start in range(0, rows, 100_000):
+            f.write(
+                "".join(
+                    f"{rng.randrange(low, high)}   {rng.randrange(low, high)}\n"
+                    for _ in range(min(100_000, rows - start))
+                )
+            )
+
+
+def smallest_above(path: pathlib.Path, n: int, m: int) -> Tuple[Smallest, Smallest]:
+    # one rescan of the file, as d1_1 used to do for every pair
+    found: List[Smallest] = [(None, []), (None, [])]
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            for col, bound in enumerate((n, m)):
+                value = int(parts[col])
+                smallest, lines = found[col]
+                if value > bound:
+                    if smallest is None or value < smallest:
+                        found[col] = (value, [value])
+                    elif value == smallest:
+                        lines.append(value)
+    return found[0], found[1]
+
+
+def rescanning_distance(path: pathlib.Path) -> int:
+    n, m, offset_i, offset_j, diff = 0, 0, 0, 0, 0
+    while True:
+        (smallest_i, lines_i), (smallest_j, lines_j) = smallest_above(path, n, m)
+        lines_i, lines_j = lines_i[offset_i:], lines_j[offset_j:]
+        if smallest_i is None and smallest_j is None:
+            return diff
+        if not lines_i:
+            n, offset_i = n + 1, 0
+            continue
+        n, offset_i = (smallest_i, 0) if len(lines_i) == 1 else (n, offset_i + 1)
+        if not lines_j:
+            m, offset_j = m + 1, 0
+            continue
+        m, offset_j = (smallest_j, 0) if len(lines_j) == 1 else (m, offset_j + 1)
+        diff += abs(smallest_i - smallest_j)
+
+
+def timed(compute: Callable[[], int]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    result = compute()
+    return time.perf_counter() - start, result
+
+
+def main(*sizes: str) -> int:
+    """Row counts to try; pass 100000000 for the largest inputs."""
+    rows_list = [int(size) for size in sizes] or [10**6, 10**7]
+    if LocationLists.np is None:
+        print("numpy is not installed; sorting with sorted()")
+    with tempfile.TemporaryDirectory() as tmp:
+        small = pathlib.Path(tmp) / "small.txt"
+        write_lists(small, 2_000)
+        rescan, expected = timed(lambda: rescanning_distance(small))
+        single, result = timed(lambda: total_distance(*read_columns(small)))
+        assert result == expected
+        print(
+            f"2,000 rows: rescanning {rescan:.2f}s, "
+            f"single pass {single * 1000:.1f} ms"
+        )
+
+        for rows in rows_list:
+            path = pathlib.Path(tmp) / f"lists_{rows}.txt"
+            write_lists(path, rows)
+            memory, expected = timed(lambda: total_distance(*read_columns(path)))
+            chunk = max(1, rows // 16)
+            external, result = timed(lambda: external_distance(path, chunk))
+            assert result == expected
+            print(
+                f"{rows:,} rows: in memory {memory:.2f}s, "
+                f"external ({chunk:,}-row runs) {external:.2f}s"
+            )
+            path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
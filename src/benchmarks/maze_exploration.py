@@ -0,0 +1,78 @@
+import random
+import time
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.mazes import maze_rows
+from benchmarks.programs import maze_droid
+from IntCode import IntcodeVM, Memory
+from IntCodeProfiler import ProfiledVM
+from MazeExplorer import MOVED, MOVES, WALL, explore, explore_forking, step
+from Pathfinding import Pos
+
+
+class CountingVM(ProfiledVM):
+    """A ProfiledVM whose forks add to the same stats, so stats.steps counts
+    the instructions of every copy."""
+
+    def fork(self) -> "CountingVM":
+        vm = CountingVM(self.mem.fork(), self.profile)
+        vm.ip = self.ip
+        vm.rel_base = self.rel_base
+        vm.halted = self.halted
+        vm.inputs = deque(self.inputs)
+        vm.outputs = deque(self.outputs)
+        vm.stats = self.stats
+        return vm
+
+
+def random_walk(vm: IntcodeVM, start: Pos, open_cells: int, seed: int = 0) -> None:
+    # what y19d15 did before: an untried neighbour if there is one, any
+    # direction otherwise, until every open cell has been seen
+    rng = random.Random(seed)
+    pos = start
+    cells: Dict[Pos, int] = {start: MOVED}
+    seen = 1
+    while seen < open_cells:
+        moves = [m for m in MOVES if step(pos, m) not in cells] or list(MOVES)
+        move = moves[rng.randrange(len(moves))]
+        vm.send(move)
+        status = vm.run_until_output()
+        target = step(pos, move)
+        if target not in cells and status != WALL:
+            seen += 1
+        cells[target] = status
+        if status != WALL:
+            pos = target
+
+
+def measure(
+    explore_with: Callable[[IntcodeVM], object], program: List[int]
+) -> Tuple[int, float]:
+    vm = CountingVM(Memory(program))
+    start = time.perf_counter()
+    explore_with(vm)
+    return vm.stats.steps, time.perf_counter() - start
+
+
+def main() -> int:
+    # the random walk already takes over a minute on the 31x31 maze
+    for cells in (5, 10, 15):
+        rows = maze_rows(cells, seed=1, loops=0.1)
+        side = len(rows)
+        program = maze_droid(rows, (1, 1), (side - 2, side - 2), work=50)
+        open_cells = sum(row.count(0) for row in rows)
+        strategies = {
+            "random walk": lambda vm: random_walk(vm, (1, 1), open_cells),
+            "depth-first": lambda vm: explore(vm, (1, 1)),
+            "forking": lambda vm: explore_forking(vm, (1, 1)),
+        }
+        print(f"{side}x{side} maze, {open_cells} open cells")
+        for name, strategy in strategies.items():
+            steps, elapsed = measure(strategy, program)
+            print(f"  {name}: {steps:,} instructions, {elapsed * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
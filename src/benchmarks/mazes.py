@@ -0,0 +1,48 @@
+import random
+from typing import List
+
+from SparseGrid import SparseGrid
+
+WALL = 1
+
+
+def maze_rows(cells: int, seed: int = 0, loops: float = 0.0) -> List[List[int]]:
+    """A (2 * cells + 1)-square maze carved by a randomized depth-first walk.
+
+    1 is wall and 0 is open; cell (i, j) of the walk is at (2i + 1, 2j + 1).
+    A fraction loops of the remaining inner walls is knocked out afterwards,
+    so there is more than one way between most cells.
+    """
+    rng = random.Random(seed)
+    side = 2 * cells + 1
+    rows = [[WALL] * side for _ in range(side)]
+    rows[1][1] = 0
+    stack = [(1, 1)]
+    while stack:
+        a, b = stack[-1]
+        options = [
+            (a + da, b + db)
+            for da, db in ((-2, 0), (2, 0), (0, -2), (0, 2))
+            if 0 < a + da < side and 0 < b + db < side and rows[a + da][b + db]
+        ]
+        if not options:
+            stack.pop()
+            continue
+        na, nb = rng.choice(options)
+        rows[(a + na) // 2][(b + nb) // 2] = 0
+        rows[na][nb] = 0
+        stack.append((na, nb))
+    if loops:
+        for a in range(1, side - 1):
+            for b in range(1 + a % 2, side - 1, 2):
+                if rows[a][b] and rng.random() < loops:
+                    rows[a][b] = 0
+    return rows
+
+
+def maze_grid(cells: int, seed: int = 0, loops: float = 0.0) -> SparseGrid:
+    grid = SparseGrid()
+    for a, row in enumerate(maze_rows(cells, seed, loops)):
+        for b, val in enumerate(row):
+            grid.set(a, b, val)
+    return grid
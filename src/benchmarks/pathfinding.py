@@ -0,0 +1,77 @@
+import time
+from queue import Queue
+from typing import Callable, List, Tuple
+
+from benchmarks.mazes import maze_grid
+from Pathfinding import GridBitmap, astar, bfs, dijkstra, flood_fill, grid_passable
+from SparseGrid import SparseGrid
+
+
+def queue_find_path(
+    grid: SparseGrid, start: Tuple[int, int], end: Tuple[int, int]
+) -> List[Tuple[int, int]]:
+    # the search y19d15 and y19d17 used before: visited list, Queue, and a
+    # copy of the path on every enqueue
+    paths: Queue[Tuple[List[Tuple[int, int]], Tuple[int, int]]] = Queue()
+    visited: List[Tuple[int, int]] = []
+    paths.put(([start], start))
+    bounds = grid.bounds_square()
+    while paths.qsize() > 0:
+        path, loc = paths.get()
+        if (
+            loc not in visited
+            and grid.get(loc[0], loc[1]) != 1
+            and bounds[0] <= loc[0] <= bounds[1]
+            and bounds[2] <= loc[1] <= bounds[3]
+        ):
+            if loc == end:
+                return path
+            visited.append(loc)
+            for nxt in (
+                (loc[0] - 1, loc[1]),
+                (loc[0] + 1, loc[1]),
+                (loc[0], loc[1] - 1),
+                (loc[0], loc[1] + 1),
+            ):
+                paths.put(([*path, nxt], nxt))
+    return []
+
+
+def timed(search: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = search()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    for cells, legacy in ((20, True), (60, True), (300, False)):
+        grid = maze_grid(cells, loops=0.05)
+        side = 2 * cells + 1
+        start, goal = (1, 1), (side - 2, side - 2)
+        searches = {
+            "bfs": lambda: bfs(start, goal, grid_passable(grid)),
+            "dijkstra": lambda: dijkstra(start, goal, grid_passable(grid)),
+            "astar": lambda: astar(start, goal, grid_passable(grid)),
+            "bitmap bfs": lambda: GridBitmap.from_grid(grid).bfs(start, goal),
+        }
+        if legacy:
+            searches["queue + list"] = lambda: queue_find_path(grid, start, goal)
+        print(f"{side}x{side} maze")
+        lengths = set()
+        for name, search in searches.items():
+            elapsed, path = timed(search)
+            lengths.add(len(path))
+            print(f"  {name}: {elapsed * 1000:.1f} ms")
+        assert len(lengths) == 1, lengths
+        fills = {
+            "flood_fill": lambda: flood_fill([goal], grid_passable(grid)),
+            "bitmap flood_fill": lambda: GridBitmap.from_grid(grid).flood_fill([goal]),
+        }
+        for name, fill in fills.items():
+            elapsed, dist = timed(fill)
+            print(f"  {name}: {elapsed * 1000:.1f} ms, spreads in {max(dist.values())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+from typing import Dict, List, Tuple
+
+OPCODES: Dict[str, Tuple[int, int]] = {
+    "add": (1, 3),
+    "mul": (2, 3),
+    "in": (3, 1),
+    "out": (4, 1),
+    "jt": (5, 2),
+    "jf": (6, 2),
+    "lt": (7, 3),
+    "eq": (8, 3),
+    "arb": (9, 1),
+    "halt": (99, 0),
+}
+
+
+def assemble(source: str) -> List[int]:
+    """Assemble a tiny Intcode dialect used by the benchmarks.
+
+    One instruction per line, `[label:] op arg...`, `;` starts a comment.
+    Arguments are `#n` (immediate), `rN` (relative) or `n` (position). A name
+    in place of a number refers to a label; names that are never defined as
+    labels become zeroed data cells placed after the code.
+    """
+    lines: List[Tuple[str, List[str]]] = []
+    labels: Dict[str, int] = {}
+    addr = 0
+    for raw in source.splitlines():
+        line = raw.split(";")[0].strip()
+        if not line:
+            continue
+        if ":" in line:
+            label, line = line.split(":", 1)
+            labels[label.strip()] = addr
+            line = line.strip()
+            if not line:
+                continue
+        op, *args = line.split()
+        if op not in OPCODES or OPCODES[op][1] != len(args):
+            raise ValueError(f"Bad instruction: {raw!r}")
+        lines.append((op, args))
+        addr += 1 + len(args)
+
+    def resolve(name: str) -> int:
+        if name.lstrip("-").isdigit():
+            return int(name)
+        if name not in labels:
+            labels[name] = addr + len(data)
+            data.append(0)
+        return labels[name]
+
+    data: List[int] = []
+    program: List[int] = []
+    for op, args in lines:
+        code = OPCODES[op][0]
+        values = []
+        for i, arg in enumerate(args):
+            if arg.startswith("#"):
+                code += 100 * 10**i
+                values.append(resolve(arg[1:]))
+            elif arg.startswith("r") and arg[1:].lstrip("-").isdigit():
+                code += 200 * 10**i
+                values.append(int(arg[1:]))
+            else:
+                values.append(resolve(arg))
+        program.extend([code, *values])
+    return program + data
+
+
+def countdown_sum(n: int) -> List[int]:
+    """Sum n, n-1, ..., 1 in a single add/jump loop; outputs the sum."""
+    return assemble(
+        f"""
+            add #{n} #0 n
+        loop:
+            add acc n acc
+            add n #-1 n
+            jt n #loop
+            out acc
+            halt
+        """
+    )
+
+
+def nested_products(n: int) -> List[int]:
+    """Sum i * j over 0 <= i, j < n using compares and relative-mode temps."""
+    return assemble(
+        f"""
+            arb #1000
+        outer:
+            add #0 #0 j
+        inner:
+            mul i j r0
+            add acc r0 acc
+            add j #1 j
+            lt j #{n} r1
+            jt r1 #inner
+            add i #1 i
+            lt i #{n} r1
+            jt r1 #outer
+            out acc
+            halt
+        """
+    )
+
+
+def maze_droid(
+    rows: List[List[int]],
+    start: Tuple[int, int],
+    target: Tuple[int, int],
+    work: int = 0,
+) -> List[int]:
+    """A day 15 style repair droid in the maze rows (1 is wall).
+
+    Positions are (x, y) = (column, row); moves are 1 north (y + 1), 2 south,
+    3 west, 4 east. Each move answers 0 for a wall, 1 for a step and 2 for a
+    step onto target. work adds a countdown of that length to every move, to
+    stand in for the arithmetic a real droid program does.
+    """
+    side = len(rows[0])
+
+    def source(maze: int) -> str:
+        spin = (
+            f"""
+            add #{work} #0 n
+        spin:
+            add n #-1 n
+            jt n #spin
+            """
+            if work
+            else ""
+        )
+        return f"""
+            add #{start[0]} #0 x
+            add #{start[1]} #0 y
+        loop:
+            in d
+            add x #0 nx
+            add y #0 ny
+            eq d #1 c
+            add ny c ny
+            eq d #2 c
+            mul c #-1 c
+            add ny c ny
+            eq d #3 c
+            mul c #-1 c
+            add nx c nx
+            eq d #4 c
+            add nx c nx
+            mul ny #{side} cell
+            add cell nx cell
+            add cell #{maze} cell
+            arb cell
+            add r0 #0 wall
+            mul cell #-1 cell
+            arb cell
+            {spin}
+            jt wall #blocked
+            add nx #0 x
+            add ny #0 y
+            eq x #{target[0]} c
+            eq y #{target[1]} found
+            mul c found found
+            jt found #arrived
+            out #1
+            jt #1 #loop
+        arrived:
+            out #2
+            jt #1 #loop
+        blocked:
+            out #0
+            jt #1 #loop
+        """
+
+    # the maze goes after the code and its variables, wherever that ends
+    size = len(assemble(source(0)))
+    return assemble(source(size)) + [cell for row in rows for cell in row]
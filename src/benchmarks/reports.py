@@ -0,0 +1,60 @@
+import random
+import sys
+import time
+from typing import Callable, List
+
+from Reports import valid_with_single_mod
+
+# longest report the brute-force check is timed on; it is quadratic
+BRUTE_FORCE_LEVELS = 4_000
+
+
+def brute_force_safe(nums: List[int]) -> bool:
+    # what d2_1 did before: rebuild and recheck the report without each level
+    def is_valid_sequence(nums: List[int]) -> bool:
+        diffs = [nums[i + 1] - nums[i] for i in range(len(nums) - 1)]
+        rising = all(0 < d <= 3 for d in diffs)
+        falling = all(-3 <= d < 0 for d in diffs)
+        return rising or falling
+
+    if is_valid_sequence(nums):
+        return True
+    return any(is_valid_sequence(nums[:i] + nums[i + 1 :]) for i in range(len(nums)))
+
+
+def random_report(rng: random.Random, levels: int, faults: int) -> List[int]:
+    # a safe report with a few levels replaced by arbitrary ones
+    sign = rng.choice((1, -1))
+    nums = [rng.randrange(100)]
+    for _ in range(levels - 1):
+        nums.append(nums[-1] + sign * rng.randint(1, 3))
+    for _ in range(faults):
+        nums[rng.randrange(levels)] = rng.randrange(-10, 110 + 3 * levels)
+    return nums
+
+
+def timed(check_with: Callable[[List[int]], bool], nums: List[int]) -> float:
+    start = time.perf_counter()
+    check_with(nums)
+    return time.perf_counter() - start
+
+
+def main(*sizes: str) -> int:
+    """Report lengths to time; the brute force stops at BRUTE_FORCE_LEVELS."""
+    lengths = [int(size) for size in sizes] or [100, 1_000, 4_000, 10**5, 10**6]
+    rng = random.Random(0)
+    for levels in lengths:
+        # one bad level near the end: the brute force tries almost every removal
+        nums = random_report(rng, levels, 0)
+        nums[-2] = nums[0]
+        linear = timed(valid_with_single_mod, nums)
+        line = f"{levels:,} levels: linear {linear * 1000:.2f} ms"
+        if levels <= BRUTE_FORCE_LEVELS:
+            brute = timed(brute_force_safe, nums)
+            line += f", brute force {brute * 1000:.1f} ms"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
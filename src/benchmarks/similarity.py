@@ -0,0 +1,57 @@
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+from typing import Callable, Tuple
+
+import LocationLists
+from LocationLists import merge_similarity, similarity
+
+# Counters and the pure-Python merge-join get slow past this many rows
+PYTHON_ROWS = 10**7
+
+
+def random_column(rows: int, seed: int) -> array:
+    # location IDs as in the puzzle input, so the columns share many keys
+    if LocationLists.np is not None:
+        rng = LocationLists.np.random.default_rng(seed)
+        return array("q", rng.integers(10**4, 10**5, rows).tobytes())
+    rng = random.Random(seed)
+    return array("q", (rng.randrange(10**4, 10**5) for _ in range(rows)))
+
+
+def counter_similarity(left: array, right: array) -> int:
+    # what d2_2 used to do, minus the printing
+    freq_left, freq_right = Counter(left), Counter(right)
+    return sum(key * freq_right.get(key, 0) for key in freq_left)
+
+
+def timed(compute: Callable[[], int]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    result = compute()
+    return time.perf_counter() - start, result
+
+
+def main(*sizes: str) -> int:
+    """Row counts to try; pure-Python variants stop at PYTHON_ROWS."""
+    rows_list = [int(size) for size in sizes] or [10**5, 10**6, 10**7, 3 * 10**7]
+    if LocationLists.np is None:
+        print("numpy is not installed; similarity() falls back to a Counter")
+    for rows in rows_list:
+        left, right = random_column(rows, 1), random_column(rows, 2)
+        kernel, result = timed(lambda: similarity(left, right))
+        line = f"{rows:,} rows: similarity {kernel:.2f}s"
+        if rows <= PYTHON_ROWS:
+            counters, expected = timed(lambda: counter_similarity(left, right))
+            merged, joined = timed(
+                lambda: merge_similarity(sorted(left), sorted(right))
+            )
+            assert result == expected == joined
+            line += f", Counters {counters:.2f}s, sorted merge-join {merged:.2f}s"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import random
+import time
+from typing import Callable, List, Tuple
+
+from SparseGrid import SparseGrid
+
+
+class ScanGrid(SparseGrid):
+    """SparseGrid with the old bounds: a scan over every cell per query."""
+
+    def bounds_square(self) -> Tuple[int, int, int, int]:
+        if not self._map:
+            return (0, 0, 0, 0)
+        ys = [y for (y, _), v in self._map.items() if v != 0]
+        xs = [x for (_, x), v in self._map.items() if v != 0]
+        min_y, max_y = min(ys), max(ys)
+        min_x, max_x = min(xs), max(xs)
+
+        h = max_y - min_y + 1
+        w = max_x - min_x + 1
+        side = max(h, w)
+        return (min_y, min_y + side - 1, min_x, min_x + side - 1)
+
+
+def filled(grid: SparseGrid, side: int) -> SparseGrid:
+    for y in range(side):
+        for x in range(side):
+            grid.set(y, x, 1 + (x * y) % 9)
+    return grid
+
+
+def frames(side: int, count: int, seed: int = 0) -> List[List[Tuple[int, int, int]]]:
+    # a few cells change per frame, sometimes clearing one on the edge
+    rng = random.Random(seed)
+    return [
+        [
+            (rng.randrange(side), rng.choice((0, side - 1)), rng.randrange(2)),
+            (rng.randrange(side), rng.randrange(side), rng.randrange(10)),
+            (rng.randrange(side), rng.randrange(side), rng.randrange(10)),
+        ]
+        for _ in range(count)
+    ]
+
+
+def loop_time(
+    grid: SparseGrid,
+    updates: List[List[Tuple[int, int, int]]],
+    draw: Callable[[SparseGrid], object],
+) -> float:
+    start = time.perf_counter()
+    for changes in updates:
+        for y, x, value in changes:
+            grid.set(y, x, value)
+        draw(grid)
+    return time.perf_counter() - start
+
+
+def render_quietly(grid: SparseGrid) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid.render()
+
+
+def main() -> int:
+    side = 360
+    print(f"{side * side:,} cells")
+    for name, draw, count in (
+        ("bounds per frame", lambda grid: grid.bounds_square(), 500),
+        ("render per frame", render_quietly, 5),
+    ):
+        updates = frames(side, count)
+        scan = loop_time(filled(ScanGrid(), side), updates, draw)
+        tracked = loop_time(filled(SparseGrid(), side), updates, draw)
+        print(
+            f"{name}, {count} frames: scan {scan * 1000:.1f} ms, "
+            f"tracked {tracked * 1000:.1f} ms, {scan / tracked:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
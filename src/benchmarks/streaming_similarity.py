@@ -0,0 +1,45 @@
+import pathlib
+import sys
+import tempfile
+
+from benchmarks.external_sort import traced
+from benchmarks.location_lists import write_lists
+from LocationLists import (
+    read_columns,
+    similarity,
+    sketch_similarity,
+    streaming_similarity,
+)
+
+CHUNK_ROWS = 1 << 16
+# location IDs are drawn from [10**5, 10**5 + KEYS), so at most KEYS are distinct
+KEYS = 10**4
+
+
+def main(*sizes: str) -> int:
+    """Row counts to try; the streaming modes should hold their peak while
+    reading everything at once grows with the file."""
+    rows_list = [int(size) for size in sizes] or [10**5, 10**6]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            path = pathlib.Path(tmp) / f"lists_{rows}.txt"
+            write_lists(path, rows, low=10**5, high=10**5 + KEYS)
+            t_mem, m_mem, expected = traced(lambda: similarity(*read_columns(path)))
+            t_str, m_str, result = traced(
+                lambda: streaming_similarity(path, CHUNK_ROWS)
+            )
+            assert result == expected
+            t_cms, m_cms, estimate = traced(lambda: sketch_similarity(path, CHUNK_ROWS))
+            assert estimate >= expected
+            print(
+                f"{rows:,} rows: in memory {t_mem:.2f}s {m_mem:.1f} MiB, "
+                f"streaming {t_str:.2f}s {m_str:.1f} MiB, "
+                f"sketch {t_cms:.2f}s {m_cms:.1f} MiB "
+                f"(+{(estimate - expected) / expected:.3%})"
+            )
+            path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
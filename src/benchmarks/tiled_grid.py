@@ -0,0 +1,99 @@
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Tuple, Union
+
+from SparseGrid import SparseGrid
+from TiledGrid import TiledGrid
+
+Grid = Union[SparseGrid, TiledGrid]
+Cells = List[Tuple[int, int, int]]
+
+
+def dense_cells(side: int) -> Cells:
+    return [(y, x, 1 + (x * y) % 9) for y in range(side) for x in range(side)]
+
+
+def scattered_cells(count: int, span: int, seed: int = 0) -> Cells:
+    rng = random.Random(seed)
+    return [
+        (rng.randrange(span), rng.randrange(span), rng.randrange(1, 10))
+        for _ in range(count)
+    ]
+
+
+def build(make: Callable[[], Grid], cells: Cells) -> Grid:
+    grid = make()
+    for y, x, value in cells:
+        grid.set(y, x, value)
+    return grid
+
+
+def allocated(make: Callable[[], Grid], cells: Cells) -> int:
+    tracemalloc.start()
+    grid = build(make, cells)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del grid
+    return size
+
+
+def best_time(scan: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scan()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def get_scan(grid: Grid) -> int:
+    # what render used to do: one lookup per cell in the bounds
+    min_y, max_y, min_x, max_x = grid.bounds_square()
+    get = grid.get
+    return sum(
+        get(y, x) for y in range(min_y, max_y + 1) for x in range(min_x, max_x + 1)
+    )
+
+
+def row_scan(grid: Grid) -> int:
+    min_y, max_y, min_x, max_x = grid.bounds_square()
+    return sum(sum(grid.row(y, min_x, max_x + 1)) for y in range(min_y, max_y + 1))
+
+
+def region_scan(grid: Grid) -> int:
+    min_y, max_y, min_x, max_x = grid.bounds_square()
+    cells = grid.region(min_y, max_y + 1, min_x, max_x + 1)
+    return sum(value for _, _, value in cells)
+
+
+def main() -> int:
+    makers = {
+        "tuple dict": SparseGrid,
+        "tiles q": TiledGrid,
+        "tiles B": lambda: TiledGrid("B"),
+    }
+    all_scans = {"get": get_scan, "row": row_scan, "region": region_scan}
+    layouts = {
+        "dense 360x360": (dense_cells(360), all_scans),
+        # a cell-by-cell scan of 2048x2048 takes too long to be worth timing
+        "20,000 cells in 2048x2048": (
+            scattered_cells(20_000, 2048),
+            {"region": region_scan},
+        ),
+    }
+    for layout, (cells, scans) in layouts.items():
+        print(layout)
+        for name, make in makers.items():
+            size = allocated(make, cells)
+            grid = build(make, cells)
+            times = ", ".join(
+                f"{label} {best_time(lambda: scan(grid)) * 1000:.1f} ms"
+                for label, scan in scans.items()
+            )
+            print(f"  {name}: {size / 1e6:.2f} MB, {times}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,97 +1,24 @@
-import heapq
+import pathlib
 import sys
-from collections import defaultdict
 
+from LocationLists import external_distance, read_columns, total_distance
 
-def stream_smallest_two_columns(file_path, n, offset_i, m, offset_j):
-    # Track smallest > n for left column
-    smallest_i = None
-    lines_i = []
 
-    # Track smallest > m for right column
-    smallest_j = None
-    lines_j = []
+def main(mode: str = "memory", run_size: str = "1000000") -> int:
+    """mode "memory" sorts both columns in RAM; "external" sorts runs of
+    run_size rows on disk and merges them, for inputs that do not fit."""
+    input_file = pathlib.Path(__file__).parent / "input.txt"
 
-    with open(file_path, 'r') as f:
-        for line in f:
-            parts = line.strip().split()
-            if len(parts) < 2:
-                continue
-            try:
-                left = int(parts[0])
-                right = int(parts[1])
-            except ValueError:
-                continue
-
-            # --- left column ---
-            if left > n:
-                if smallest_i is None or left < smallest_i:
-                    smallest_i = left
-                    lines_i = [left]
-                elif left == smallest_i:
-                    lines_i.append(left)
-
-            # --- right column ---
-            if right > m:
-                if smallest_j is None or right < smallest_j:
-                    smallest_j = right
-                    lines_j = [right]
-                elif right == smallest_j:
-                    lines_j.append(right)
-
-    # Apply offsets, always return smallest number even if resulting list is empty
-    result_i = lines_i[offset_i:] if smallest_i is not None else []
-    result_j = lines_j[offset_j:] if smallest_j is not None else []
-
-    return (smallest_i, result_i), (smallest_j, result_j)
-
-
-if __name__ == "__main__":
-
-    n, m = 0, 0
-    offset_i, offset_j = 0, 0
-
-    diff = 0
-    while True:
-        (smallest_i, lines_i), (smallest_j, lines_j) = stream_smallest_two_columns(
-            "./input.txt",
-            n, offset_i,
-            m, offset_j
-        )
-
-        if smallest_i is None and smallest_j is None:
-            break
-
-        if not lines_i:
-            n += 1
-            offset_i = 0
-            continue
-        else:
-            if len(lines_i) == 1:
-                n = smallest_i
-                offset_i = 0
-            else:
-                offset_i += 1
-           
-        if not lines_j:
-            m += 1
-            offset_j = 0
-            continue
-        else:
-            if len(lines_j) == 1:
-                m = smallest_j
-                offset_j = 0
-            else:
-                offset_j += 1
-        
-         
-
-        print("Smallest left number:", smallest_i, "Lines:", lines_i)
-        print("Smallest right number:", smallest_j, "Lines:", lines_j)
-
-        diff += abs(smallest_i - smallest_j)
-        # update n/m to previous smallest for next iteration
+    if mode == "memory":
+        diff = total_distance(*read_columns(input_file))
+    elif mode == "external":
+        diff = external_distance(input_file, int(run_size))
+    else:
+        raise ValueError(f"Unknown mode {mode!r}, expected memory or external")
 
     print(diff)
+    return 0
 
 
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
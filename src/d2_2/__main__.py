@@ -1,10 +1,19 @@
-import heapq
+import os
+import pathlib
 import sys
-from collections import Counter, defaultdict
+from collections import Counter
 from typing import List, Tuple
 
+from LocationLists import (
+    external_similarity,
+    read_columns,
+    similarity,
+    sketch_similarity,
+    streaming_similarity,
+)
 
-def parse_and_sort_file(file_path: str) -> Tuple[List[int], List[int]]:
+
+def parse_and_sort_file(file_path: str | os.PathLike) -> Tuple[List[int], List[int]]:
     left_column: List[int] = []
     right_column: List[int] = []
 
@@ -24,10 +33,33 @@ def parse_and_sort_file(file_path: str) -> Tuple[List[int], List[int]]:
     return left_column, right_column
 
 
+def main(mode: str = "memory", run_size: str = "1000000") -> int:
+    """mode "memory" scores both columns in RAM and prints only the total;
+    "verbose" also prints the counts and every matching key; "external"
+    sorts runs of run_size rows on disk and merge-joins the sorted columns.
+    "streaming" holds just the distinct left keys and counts the right
+    column against them, and "sketch" estimates the score in fixed memory
+    with a Count-Min sketch; both read run_size rows at a time."""
+    input_file = pathlib.Path(__file__).parent / "input.txt"
 
-if __name__ == "__main__":
+    if mode == "memory":
+        print(similarity(*read_columns(input_file)))
+        return 0
+    streamed = {
+        "external": external_similarity,
+        "streaming": streaming_similarity,
+        "sketch": sketch_similarity,
+    }
+    if mode in streamed:
+        print(streamed[mode](input_file, int(run_size)))
+        return 0
+    if mode != "verbose":
+        raise ValueError(
+            f"Unknown mode {mode!r}, expected memory, verbose, "
+            "external, streaming or sketch"
+        )
 
-    (left_column, right_column) = parse_and_sort_file("input.txt")
+    (left_column, right_column) = parse_and_sort_file(input_file)
 
     similarity_map = {}
 
@@ -41,14 +73,15 @@ if __name__ == "__main__":
         other_freq = freq_right.get(key, 0)
         sim_delta = key * other_freq
         if sim_delta > 0:
-            print(f"{key} appears {other_freq} times in right, so similarity += {sim_delta}")
+            print(
+                f"{key} appears {other_freq} times in right, "
+                f"so similarity += {sim_delta}"
+            )
         similarity_map[key] = similarity_map.get(key, 0) + sim_delta
 
-    # for key in freq_right:
-    #     other_freq = freq_left.get(key, 0)
-    #     sim_delta = key * other_freq
-    #     if sim_delta > 0:
-    #         print(f"{key} appears {other_freq} times in left, so similarity += {sim_delta}")
-    #     similarity_map[key] = similarity_map.get(key, 0) + sim_delta
+    print(sum(similarity_map.values()))
+    return 0
 
-    print(sum(similarity_map.values()))
\ No newline at end of file
+
+if __name__ == "__main__":
+    raise SystemExit(main(*sys.argv[1:]))
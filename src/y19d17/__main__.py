@@ -1,21 +1,18 @@
 import pathlib
-import queue
 import random
+import sys
 from encodings.punycode import T
 from enum import Enum
 from operator import contains
-from queue import Queue
 from typing import Callable, List, Tuple
 
+from DenseGrid import DenseGrid
 from IntCode import run_intcode
+from IntCodeLoader import load_memory
+from Pathfinding import bfs, grid_passable
 from SparseGrid import SparseGrid
 
 
-def parse_program(text: str) -> dict[int, int]:
-    parts = [int(p.strip()) for p in text.replace("\n", ",").split(",")]
-    return {i: v for i, v in enumerate(parts)}
-
-
 # print_ascii by chatGPT
 def print_ascii(
     panels: List[List[int]], cur_loc: Tuple[int, int], heading: Tuple[int, int]
@@ -72,39 +69,7 @@ def path_to_ops(path: List[Tuple[int, int]]) -> List[int]:
 def find_path(
     grid: SparseGrid, start: Tuple[int, int], end: Tuple[int, int]
 ) -> List[Tuple[int, int]]:
-    paths: Queue[Tuple[List[Tuple[int, int]], Tuple[int, int]]] = Queue()
-
-    visited: List[Tuple[int, int]] = []
-    paths.put(([start], start))
-
-    bounds = grid.bounds_square()
-
-    while paths.qsize() > 0:
-        path = paths.get()
-        loc = path[1]
-
-        if loc == end:
-            return path[0]
-
-        if (
-            loc not in visited
-            and grid.get(loc[0], loc[1]) != 1
-            and loc[0] >= bounds[0]
-            and loc[0] <= bounds[1]
-            and loc[1] >= bounds[2]
-            and loc[1] <= bounds[3]
-        ):
-            visited.append(loc)
-            left = (loc[0] - 1, loc[1])
-            paths.put(([*path[0], left], left))
-            right = (loc[0] + 1, loc[1])
-            paths.put(([*path[0], right], right))
-            down = (loc[0], loc[1] - 1)
-            paths.put(([*path[0], down], down))
-            up = (loc[0], loc[1] + 1)
-            paths.put(([*path[0], up], up))
-
-    return []
+    return bfs(start, end, grid_passable(grid))
 
 
 def get_target_xy(cur_xy: Tuple[int, int], movement_op: int) -> Tuple[int, int]:
@@ -121,7 +86,7 @@ def get_target_xy(cur_xy: Tuple[int, int], movement_op: int) -> Tuple[int, int]:
     return target_xy
 
 
-def main() -> int:
+def main(engine: str = "interp") -> int:
 
     input_file = pathlib.Path(__file__).parent / "input.txt"
 
@@ -132,29 +97,13 @@ def main() -> int:
         for row in grid:
             print("".join(chr(val) for val in row))
 
-    def find_intersections(grid: list[List[int]]):
-        intersections = []
-        rows, cols = len(grid), len(grid[0])
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r][c] == ord("#"):
-                    neighbors = 0
-                    for dr, dc in [
-                        (0, 1),
-                        (1, 0),
-                        (0, -1),
-                        (-1, 0),
-                    ]:
-                        nr, nc = r + dr, c + dc
-                        if (
-                            0 <= nr < rows
-                            and 0 <= nc < cols
-                            and grid[nr][nc] == ord("#")
-                        ):
-                            neighbors += 1
-                    if neighbors > 2:
-                        intersections.append((r, c))
-        return intersections
+    def find_intersections(grid: list[List[int]]) -> List[Tuple[int, int]]:
+        # scaffold cells with scaffold on more than two sides, in one sweep
+        dense = DenseGrid.from_rows(grid)
+        scaffold = dense.mask(lambda val: val == ord("#"))
+        neighbours = dense.neighbour_counts(scaffold)
+        crossings = dense.mask(lambda val, n: (val == ord("#")) & (n > 2), neighbours)
+        return dense.where(crossings)
 
     def write_in() -> int:
         return 0
@@ -174,13 +123,12 @@ def main() -> int:
             grid[-1].append(val)
         lastval = val
 
-    with open(input_file, "r", encoding="utf-8") as f:
-        mem = parse_program(f.read())
-        mem[0] = 2
-        run_intcode(mem, write_in, read_out)
+    mem = load_memory(input_file)
+    mem[0] = 2
+    run_intcode(mem, write_in, read_out, engine)
 
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main(*sys.argv[1:]))
@@ -1,43 +1,13 @@
-import sys
-from typing import List
-
-VALID_OPS = (1, 2)
-
-def parse_program(text: str) -> List[int]:
-    parts = [p.strip() for p in text.replace("\n", ",").split(",")]
-    return [int(p) for p in parts if p != ""]
-
-def run_intcode(mem: List[int]) -> None:
-    ip = 0
-    while True:
-        try:
-            op = mem[ip]
-        except IndexError:
-            raise RuntimeError(f"Instruction pointer out of bounds: ip={ip}")
-        if op == 99:
-            return
-        if op not in VALID_OPS:
-            raise RuntimeError(f"Unknown opcode {op} at position {ip}")
-        try:
-            a, b, out = mem[ip + 1], mem[ip + 2], mem[ip + 3]
-        except IndexError:
-            raise RuntimeError(f"Incomplete instruction at ip={ip}")
-        if not (0 <= a < len(mem) and 0 <= b < len(mem) and 0 <= out < len(mem)):
-            raise RuntimeError(f"Parameter out of bounds at ip={ip}: a={a}, b={b}, out={out}, len={len(mem)}")
-        if op == 1:
-            mem[out] = mem[a] + mem[b]
-        elif op == 2:
-            mem[out] = mem[a] * mem[b]
-        ip += 4
+from IntCode import run_intcode
+from IntCodeLoader import load_program
 
 def main() -> int:
-    with open("input.txt", "r", encoding="utf-8") as f:
-        mem = parse_program(f.read())
+    mem = load_program("input.txt")
 
     mem[1] = 12
     mem[2] = 2
 
-    run_intcode(mem)
+    run_intcode(mem, profile="day2")
     print(mem[0])
     return 0
 
@@ -5,46 +5,17 @@ from typing import Callable, List, Tuple
 
 from functional import seq
 
-VALID_OPS = (1, 2)
+from IntCode import run_intcode as run_program
+from IntCodeLoader import load_program
 
 
-def parse_program(text: str) -> List[int]:
-    parts = [p.strip() for p in text.replace("\n", ",").split(",")]
-    return [int(p) for p in parts if p != ""]
-
 @lru_cache
 def load_mem_cached() -> List[int]:
-    with open("input.txt", "r", encoding="utf-8") as f:
-        mem = parse_program(f.read())
-        return mem
+    return load_program("input.txt")
 
 def run_intcode(nvMem: Tuple[Tuple[int, int], List[int]]) -> Tuple[Tuple[int, int], List[int]]:
-    mem = nvMem[1]
-    nv = nvMem[0]
-    ip = 0
-    while True:
-        try:
-            op = mem[ip]
-        except IndexError:
-            raise RuntimeError(f"Instruction pointer out of bounds: ip={ip}")
-        if op == 99:
-            break
-        if op not in VALID_OPS:
-            raise RuntimeError(f"Unknown opcode {op} at position {ip}")
-        try:
-            a, b, out = mem[ip + 1], mem[ip + 2], mem[ip + 3]
-        except IndexError:
-            raise RuntimeError(f"Incomplete instruction at ip={ip}")
-        if not (0 <= a < len(mem) and 0 <= b < len(mem) and 0 <= out < len(mem)):
-            raise RuntimeError(
-                f"Parameter out of bounds at ip={ip}: a={a}, b={b}, out={out}, len={len(mem)}"
-            )
-        if op == 1:
-            mem[out] = mem[a] + mem[b]
-        elif op == 2:
-            mem[out] = mem[a] * mem[b]
-        ip += 4
-
+    nv, mem = nvMem
+    run_program(mem, profile="day2")
     return (nv, mem)
 
 def map_tuple_2[A, B, C](f: Callable[[B], C]) -> Callable[[Tuple[A, B]], Tuple[A, C]]:
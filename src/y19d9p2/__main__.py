@@ -1,171 +1,24 @@
 import pathlib
-from enum import Enum
-from typing import Callable, List, Tuple
-
-
-class OP(Enum):
-    ADD = (1, 3)
-    MULT = (2, 3)
-    HALT = (99, 0)
-    IN = (3, 1)
-    OUT = (4, 1)
-    JUMP_TRUE = (5, 2)
-    JUMP_FALSE = (6, 2)
-    LESS_THAN = (7, 3)
-    EQUALS = (8, 3)
-    UDATE_REL_BASE = (9, 1)
-
-    def __init__(self, code, args):
-        self.code = code
-        self.args = args
-
-    @classmethod
-    def from_code(cls, code):
-        return next((op for op in cls if op.code == code), OP.HALT)
-
-
-def parse_program(text: str) -> dict[int, int]:
-    parts = [int(p.strip()) for p in text.replace("\n", ",").split(",")]
-    return {i: v for i, v in enumerate(parts)}
-
-
-def parse_op(op: int) -> Tuple[OP, List[int]]:
-    code = op % 100
-    op = op // 100
-    modes = [0, 0, 0, 0]
-    for i in range(3):
-        modes[i] = op % 10
-        op = op // 10
-
-    return (OP.from_code(code), modes)
-
-
-def run_intcode(
-    mem: dict[int, int],
-    in_f: Callable[[], int] = (lambda: int(input("input> "))),
-    out_f: Callable[[int], None] = print,
-) -> None:
-    print(mem)
-    ip = 0
-    rel_base = 0
-
-    def next_mem() -> int:
-        nonlocal ip
-        val = mem.get(ip, 0)
-        ip += 1
-        return val
-
-    def param_read(mode, val) -> int:
-        if mode == 0:
-            return mem.get(val, 0)
-        elif mode == 1:
-            return val
-        elif mode == 2:
-            return mem.get(rel_base + val, 0)
-        else:
-            raise RuntimeError(f"Invalid parameter mode: {mode}")
-
-    def addr_write(mode, val) -> int:
-        if mode == 2:
-            return rel_base + val
-        else:
-            return val
-
-    while True:
-        try:
-            op, modes = parse_op(next_mem())
-        except IndexError:
-            raise RuntimeError(f"Instruction pointer out of bounds: ip={ip}")
-
-        args = [next_mem() for _ in range(op.args)]
-
-        if op == OP.ADD:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = a + b
-
-        elif op == OP.MULT:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = a * b
-
-        elif op == OP.IN:
-            val = in_f()
-            out_addr = addr_write(modes[0], args[0])
-            mem[out_addr] = val
-
-        elif op == OP.OUT:
-            val = param_read(modes[0], args[0])
-            out_f(val)
-
-        elif op == OP.JUMP_TRUE:
-            val = param_read(modes[0], args[0])
-            if val != 0:
-                ip = param_read(modes[1], args[1])
-
-        elif op == OP.JUMP_FALSE:
-            val = param_read(modes[0], args[0])
-            if val == 0:
-                ip = param_read(modes[1], args[1])
-
-        elif op == OP.LESS_THAN:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = 1 if a < b else 0
-
-        elif op == OP.EQUALS:
-            a = param_read(modes[0], args[0])
-            b = param_read(modes[1], args[1])
-            out_addr = addr_write(modes[2], args[2])
-            mem[out_addr] = 1 if a == b else 0
-
-        elif op == OP.UDATE_REL_BASE:
-            rel_base = rel_base + param_read(modes[0], args[0])
-
-        elif op == OP.HALT:
-            return
-
-        else:
-            raise RuntimeError(f"Unexpected op {op} at ip={ip}")
-
+import sys
+from typing import List, Tuple
 
-# print_ascii by chatGPT
-def print_ascii(
-    panels: List[List[int]], cur_loc: Tuple[int, int], heading: Tuple[int, int]
-) -> None:
-    rows, cols = len(panels), len(panels[0])
+from IntCode import IntcodeVM
+from IntCodeLoader import load_memory
+from Screen import make_screen
 
-    # choose a character to represent heading
-    heading_char = {
-        (-1, 0): "^",
-        (1, 0): "v",
-        (0, -1): "<",
-        (0, 1): ">",
-    }[heading]
+HEADING_CHARS = {(-1, 0): "^", (1, 0): "v", (0, -1): "<", (0, 1): ">"}
 
-    for r in range(rows):
-        line = []
-        for c in range(cols):
-            if (r, c) == cur_loc:
-                line.append(heading_char)
-            else:
-                line.append("#" if panels[r][c] == 1 else ".")
-        print("".join(line))
 
-
-def main() -> int:
+def main(mode: str = "headless") -> int:
 
     input_file = pathlib.Path(__file__).parent / "input.txt"
+    screen = make_screen(mode, blank=".")
 
     painted: List[List[int]] = [[0 for _ in range(101)] for _ in range(101)]
     panels: List[List[int]] = [[0 for _ in range(101)] for _ in range(101)]
     cur_loc: Tuple[int, int] = (50, 50)
     panels[cur_loc[0]][cur_loc[1]] = 1
     heading: Tuple[int, int] = (-1, 0)
-    out_index = 0
 
     def turn(heading: Tuple[int, int], dir: int):
         down, right = heading
@@ -176,30 +29,31 @@ def main() -> int:
         else:
             raise ValueError("direction must be 0 (left) or 1 (right)")
 
-    def write_in() -> int:
-        nonlocal out_index
-        out_index = 0
-        return panels[cur_loc[0]][cur_loc[1]]
-
-    def read_out(val: int):
-        nonlocal out_index
-        nonlocal heading
-        nonlocal cur_loc
-        if out_index == 0:
-            panels[cur_loc[0]][cur_loc[1]] = val
-            painted[cur_loc[0]][cur_loc[1]] = 1
-            print_ascii(panels, cur_loc, heading)
-        elif out_index == 1:
-            heading = turn(heading, val)
-            cur_loc = (cur_loc[0] + heading[0], cur_loc[1] + heading[1])
-            print_ascii(panels, cur_loc, heading)
-        else:
-            raise RuntimeError("More than 2 outputs since last input")
-        out_index += 1
+    def paint(color: int) -> None:
+        panels[cur_loc[0]][cur_loc[1]] = color
+        painted[cur_loc[0]][cur_loc[1]] = 1
+        screen.set(cur_loc[1], cur_loc[0], "#" if color == 1 else ".")
+
+    vm = IntcodeVM(load_memory(input_file))
+
+    for paint_turn in vm.coroutine(2):
+        if paint_turn is None:
+            # a colour without a turn is still painted
+            if vm.outputs:
+                paint(vm.outputs.popleft())
+            vm.send(panels[cur_loc[0]][cur_loc[1]])
+            continue
+
+        color, direction = paint_turn
+        paint(color)
+        heading = turn(heading, direction)
+        cur_loc = (cur_loc[0] + heading[0], cur_loc[1] + heading[1])
+        screen.set(cur_loc[1], cur_loc[0], HEADING_CHARS[heading])
+        screen.frame()
 
-    with open(input_file, "r", encoding="utf-8") as f:
-        mem = parse_program(f.read())
-        run_intcode(mem, write_in, read_out)
+    # the program can halt after a colour without turning
+    if vm.outputs:
+        paint(vm.outputs.popleft())
 
     print(sum(sum(row) for row in painted))
 
@@ -207,4 +61,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main(*sys.argv[1:]))
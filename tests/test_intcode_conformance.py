@@ -0,0 +1,248 @@
+"""Conformance tests for the Intcode engine.
+
+Runs the puzzle examples and every Intcode input in the repo under each
+engine, each memory backing and the profile the puzzle needs, and checks the
+known answers. y19d2p2 and y19d3p1 share y19d2p1's input and y19d15 has a
+copy of y19d12's, so five programs cover them all.
+"""
+
+import pathlib
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+import pytest
+
+from IntCode import ENGINES, IntcodeVM, Memory
+from IntCodeLoader import load_program
+
+SRC = pathlib.Path(__file__).parent.parent / "src"
+
+QUINE = [109, 1, 204, -1, 1001, 100, 1, 100, 1008, 100, 16, 101, 1006, 101, 0, 99]
+COMPARE_8 = [
+    3, 21, 1008, 21, 8, 20, 1005, 20, 22, 107, 8, 21, 20, 1006, 20, 31, 1106, 0,
+    36, 98, 0, 0, 1002, 21, 125, 20, 4, 20, 1105, 1, 46, 104, 999, 1105, 1, 46,
+    1101, 1000, 1, 20, 4, 20, 1105, 1, 46, 98, 99,
+]  # fmt: skip
+
+# program image -> the memory an IntcodeVM is built on
+BACKINGS: Dict[str, Callable[[List[int]], Memory | dict[int, int] | list[int]]] = {
+    "list": list,
+    "dict": lambda image: dict(enumerate(image)),
+    "memory": Memory,
+}
+
+
+class Case(NamedTuple):
+    name: str
+    program: List[int]
+    profile: str
+    # drives a fresh VM and returns what should equal expected
+    run: Callable[[IntcodeVM], object]
+    expected: object
+
+
+def load(name: str) -> List[int]:
+    return load_program(SRC / name / "input.txt")
+
+
+def outputs(*inputs: int) -> Callable[[IntcodeVM], object]:
+    def run(vm: IntcodeVM) -> object:
+        vm.send(*inputs)
+        vm.run()
+        return list(vm.outputs)
+
+    return run
+
+
+def poked(writes: List[Tuple[int, int]]) -> Callable[[IntcodeVM], object]:
+    # writes go to vm.mem in order before the run, unlike a cells() patch
+    def run(vm: IntcodeVM) -> object:
+        for addr, val in writes:
+            vm.mem[addr] = val
+        vm.run()
+        return list(vm.outputs)
+
+    return run
+
+
+def resumed(
+    writes: List[Tuple[int, int]], *inputs: int
+) -> Callable[[IntcodeVM], object]:
+    # run until the program wants input, patch memory, then send inputs
+    def run(vm: IntcodeVM) -> object:
+        vm.run()
+        for addr, val in writes:
+            vm.mem[addr] = val
+        vm.send(*inputs)
+        vm.run()
+        return list(vm.outputs)
+
+    return run
+
+
+def input_from(addr: int) -> Callable[[IntcodeVM], object]:
+    # every input is read back from memory, as a callback may do mid-run
+    def run(vm: IntcodeVM) -> object:
+        vm.run(in_f=lambda: vm.mem[addr])
+        return list(vm.outputs)
+
+    return run
+
+
+def patched_by(
+    hook: str, call: int, addr: int, val: int, *inputs: int
+) -> Callable[[IntcodeVM], object]:
+    # in_f feeds inputs; on its call-th call the hook ("in_f" or "out_f")
+    # writes val to addr, so memory changes under a running engine
+    def run(vm: IntcodeVM) -> object:
+        feed = iter(inputs)
+        calls = {"in_f": 0, "out_f": 0}
+        seen: List[int] = []
+
+        def callback(name: str) -> None:
+            calls[name] += 1
+            if name == hook and calls[name] == call:
+                vm.mem[addr] = val
+
+        def in_f() -> int:
+            callback("in_f")
+            return next(feed)
+
+        def out_f(value: int) -> None:
+            callback("out_f")
+            seen.append(value)
+
+        vm.run(in_f=in_f, out_f=out_f)
+        return seen, vm.mem[addr]
+
+    return run
+
+
+def cells(patch: Dict[int, int], addrs: Iterable[int]) -> Callable[[IntcodeVM], object]:
+    def run(vm: IntcodeVM) -> object:
+        for addr, val in patch.items():
+            vm.mem[addr] = val
+        vm.run()
+        return [vm.mem[addr] for addr in addrs]
+
+    return run
+
+
+def rejected(vm: IntcodeVM) -> object:
+    try:
+        vm.run(in_f=lambda: 0, out_f=lambda _: None)
+    except RuntimeError:
+        return "rejected"
+    return "ran"
+
+
+def block_tiles(vm: IntcodeVM) -> object:
+    vm.run()
+    return list(vm.outputs)[2::3].count(2)
+
+
+def breakout(vm: IntcodeVM) -> object:
+    vm.mem[0] = 2
+    ball = paddle = score = 0
+    for chunk in vm.coroutine(3):
+        if chunk is None:
+            vm.send((ball > paddle) - (ball < paddle))
+            continue
+        x, y, tile = chunk
+        if (x, y) == (-1, 0):
+            score = tile
+        elif tile == 4:
+            ball = x
+        elif tile == 3:
+            paddle = x
+    return score
+
+
+def alignment(vm: IntcodeVM) -> object:
+    # y19d17: sum of row * column over scaffold crossings in the camera view
+    vm.mem[0] = 2
+    vm.run(in_f=lambda: 0)
+    rows: List[List[int]] = [[]]
+    for val in vm.outputs:
+        if val == ord("\n"):
+            rows.append([])
+        else:
+            rows[-1].append(val)
+
+    def scaffold(r: int, c: int) -> bool:
+        return 0 <= r < len(rows) and 0 <= c < len(rows[r]) and rows[r][c] == ord("#")
+
+    return sum(
+        r * c
+        for r, row in enumerate(rows)
+        for c in range(len(row))
+        if scaffold(r, c)
+        and scaffold(r - 1, c) + scaffold(r + 1, c)
+        + scaffold(r, c - 1) + scaffold(r, c + 1) > 2
+    )
+
+
+def cases() -> List[Case]:
+    day2 = load("y19d2p1")
+    day5 = load("y19d5p1")
+    boost = load("y19d9p2")
+    arcade = load("y19d12")
+    camera = load("y19d17")
+    return [
+        Case("day2 example", [1, 9, 10, 3, 2, 3, 11, 0, 99, 30, 40, 50], "day2",
+             cells({}, [0, 3]), [3500, 70]),
+        Case("day2 input", day2, "day2", cells({1: 12, 2: 2}, [0]), [3790689]),
+        Case("day2 noun/verb", day2, "day2", cells({1: 65, 2: 33}, [0]), [19690720]),
+        Case("day5 equal 8", [3, 9, 8, 9, 10, 9, 4, 9, 99, -1, 8], "day5",
+             outputs(8), [1]),
+        Case("day5 immediate less than 8", [3, 3, 1107, -1, 8, 3, 4, 3, 99], "day5",
+             outputs(7), [1]),
+        Case("day5 compare below", COMPARE_8, "day5", outputs(7), [999]),
+        Case("day5 compare equal", COMPARE_8, "day5", outputs(8), [1000]),
+        Case("day5 compare above", COMPARE_8, "day5", outputs(9), [1001]),
+        Case("day5 input air conditioner", day5, "day5", outputs(1),
+             [0] * 9 + [5074395]),
+        Case("day5 input radiator", day5, "day5", outputs(5), [8346937]),
+        Case("day9 quine", QUINE, "day9", outputs(), QUINE),
+        Case("day9 16 digits", [1102, 34915192, 34915192, 7, 4, 7, 99, 0], "day9",
+             outputs(), [1219070632396864]),
+        Case("day9 large", [104, 1125899906842624, 99], "day9", outputs(),
+             [1125899906842624]),
+        Case("day9 BOOST test", boost, "day9", outputs(1), [3100786347]),
+        Case("sparse cell reached by growth", [4, 5000, 99], "day9",
+             poked([(5000, 7), (4000, 1), (5000, 8)]), [8]),
+        Case("code patched between runs",
+             [3, 20, 1001, 20, 100, 21, 4, 21, 1105, 1, 0, 99], "day9",
+             resumed([(4, 1000)], 1), [1001]),
+        Case("input callback sees memory", [1101, 40, 2, 10, 3, 11, 4, 11, 99],
+             "day9", input_from(10), [42]),
+        Case("input callback writes memory",
+             [3, 20, 4, 20, 3, 20, 4, 21, 99] + [0] * 15, "day9",
+             patched_by("in_f", 2, 21, 77, 5, 5), ([5, 77], 77)),
+        Case("output callback writes memory", [104, 1, 4, 20, 99] + [0] * 20,
+             "day9", patched_by("out_f", 1, 20, 7), ([1, 7], 7)),
+        Case("input callback patches code",
+             [3, 30, 104, 1, 1005, 30, 0, 99] + [0] * 30, "day9",
+             patched_by("in_f", 2, 3, 9, 1, 1, 1, 0), ([1, 9, 9, 9], 9)),
+        Case("output callback patches code",
+             [3, 20, 104, 1, 1005, 20, 0, 99] + [0] * 20, "day9",
+             patched_by("out_f", 1, 3, 9, 1, 1, 0), ([1, 9, 9], 9)),
+        Case("jump to a negative address",
+             [1101, 0, 104, -3, 1101, 0, 7, -2, 1101, 0, 99, -1, 1105, 1, -3],
+             "day9", outputs(), [7]),
+        Case("invalid mode on a jump not taken", [3106, 1, 0, 104, 1, 99], "day9",
+             outputs(), [1]),
+        Case("day13 blocks", arcade, "day9", block_tiles, 301),
+        Case("day13 score", arcade, "day9", breakout, 14096),
+        Case("day17 alignment", camera, "day9", alignment, 7720),
+        Case("day2 profile rejects day5", day5, "day2", rejected, "rejected"),
+        Case("day5 profile rejects day9", QUINE, "day5", rejected, "rejected"),
+        Case("unknown opcode", [1, 0, 0, 0, 42, 99], "day9", rejected, "rejected"),
+    ]  # fmt: skip
+
+
+@pytest.mark.parametrize("backing", list(BACKINGS))
+@pytest.mark.parametrize("engine", list(ENGINES))
+@pytest.mark.parametrize("case", cases(), ids=lambda case: case.name)
+def test_conformance(case: Case, engine: str, backing: str) -> None:
+    vm = IntcodeVM(BACKINGS[backing](case.program), engine, case.profile)
+    assert case.run(vm) == case.expected
@@ -0,0 +1,35 @@
+import random
+from typing import List
+
+import pytest
+
+from benchmarks.reports import brute_force_safe, random_report
+from Reports import is_valid_sequence, valid_with_single_mod
+
+# the 2024 day 2 example: (report, safe, safe with one level removed)
+EXAMPLE = [
+    ([7, 6, 4, 2, 1], True, True),
+    ([1, 2, 7, 8, 9], False, False),
+    ([9, 7, 6, 2, 1], False, False),
+    ([1, 3, 2, 4, 5], False, True),
+    ([8, 6, 4, 4, 1], False, True),
+    ([1, 3, 6, 7, 9], True, True),
+]
+
+
+@pytest.mark.parametrize("nums, safe, safe_with_removal", EXAMPLE)
+def test_example(nums: List[int], safe: bool, safe_with_removal: bool) -> None:
+    assert is_valid_sequence(nums) == safe
+    assert valid_with_single_mod(nums) == safe_with_removal
+
+
+def test_matches_brute_force() -> None:
+    # short reports, so every removal the brute force tries is covered
+    rng = random.Random(0)
+    for _ in range(20_000):
+        levels = rng.randint(0, 9)
+        if rng.random() < 0.5:
+            nums = [rng.randrange(8) for _ in range(levels)]
+        else:
+            nums = random_report(rng, max(levels, 1), rng.randint(0, 2))
+        assert valid_with_single_mod(nums) == brute_force_safe(nums), nums